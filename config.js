@@ -3,7 +3,7 @@
  *
  * 包含：
  * - 用户配置（默认账号等）
- * - AI系统提示词（指导AI生成总结）
+ * - AI系统提示词与用户提示词模板（指导AI生成总结）
  * - AI模型配置（模型选择和参数）
  *
  * @module config
@@ -56,6 +56,19 @@ const SYSTEM_PROMPT = `
 </ol>
 `;
 
+/**
+ * AI 用户提示词中的固定指令部分
+ *
+ * 时间范围与推文片段在调用时拼接到其后
+ *
+ * @constant {string}
+ */
+const USER_PROMPT_INSTRUCTIONS = `请扮演“总结大师”，用HTML生成10条中文要点，方便嵌入网页/Tg：
+- 使用<ol><li>…</li></ol>有序列表；不要输出代码块或表格
+- 聚焦事件/结论，突出数字/影响/动作，避免客套
+- 优先写发射/空投/IDO等信号（规则、时间、参与方式），再写合作/技术/市场动向
+- 如有来源链接，在该条末尾追加 <a href="链接" target="_blank">[01]</a>，多来源累加 [02][03]…`;
+
 // ==================== AI 模型配置 ====================
 
 /**
@@ -63,10 +76,12 @@ const SYSTEM_PROMPT = `
  * @constant {Object}
  * @property {string} model - 模型名称
  * @property {number} temperature - 生成温度（0-1，越高越有创造性）
+ * @property {boolean} stream - 是否使用流式响应
  */
 const AI_CONFIG = {
   model: "grok-4",  // xAI Grok 模型
-  temperature: 0.7           // 平衡创造性和准确性
+  temperature: 0.7,          // 平衡创造性和准确性
+  stream: true               // 流式接收生成结果
 };
 
 // ==================== 模块导出 ====================
@@ -75,5 +90,6 @@ module.exports = {
   FOLLOWER_SOURCE_ACCOUNT,
   TWITTER_LIST_IDS,
   SYSTEM_PROMPT,
+  USER_PROMPT_INSTRUCTIONS,
   AI_CONFIG
 };
@@ -34,9 +34,20 @@ const CONFIG = {
         'temp_store': 'MEMORY'       // 临时表存储在内存中
     },
 
+    // 推文查询可选的列（时间范围查询默认返回全部）
+    TWEET_COLUMNS: [
+        'id', 'user_id', 'username', 'screen_name', 'text', 'created_at', 'created_at_ms',
+        'retweet_count', 'like_count', 'reply_count', 'quote_count',
+        'bookmark_count', 'view_count', 'collected_at', 'media_urls'
+    ],
+
     // 批处理设置
-    BATCH_SIZE: 30,                  // 每批处理 30 条记录
-    MAX_STATEMENT_CACHE: 20          // 预处理语句缓存上限
+    WRITE_GROUP_MAX_TWEETS: 500,     // 单个写入事务最多合并的推文数（攒满立即写入）
+    WRITE_FLUSH_INTERVAL: 1000,      // 写入请求最长等待合并时间（毫秒）
+    WRITE_QUEUE_MAX_TWEETS: 5000,    // 待写队列推文上限，超出时调用方等待刷写完成再入队
+    MAX_STATEMENT_CACHE: 20,         // 预处理语句缓存上限
+    STATEMENT_CACHE_CLEANUP_INTERVAL: 30 * 60 * 1000,  // 语句缓存清理间隔（30分钟）
+    BUSY_TIMEOUT: 10000              // 数据库被另一进程锁定时的等待时间（毫秒）
 };
 
 const logger = createLogger('database');
@@ -63,12 +74,25 @@ class DatabaseManager {
         this.readOnly = readOnly;
         this.statementCache = new Map(); // 缓存预处理语句
         this.statementCacheLastCleanup = Date.now();
+        this.pendingTweetWrites = [];     // 待写入的推文请求队列 {tweets, resolve, reject}
+        this.pendingTweetCount = 0;       // 待写入队列中的推文总数
+        this.tweetWriteTimer = null;      // 定时刷写计时器
+        this.tweetFlushTask = null;       // 正在进行的刷写任务
+        this.writeLock = Promise.resolve(); // 写事务串行链，同一连接上的事务不能嵌套
+
+        // 表结构就绪（含 created_at_ms 迁移和回填）后完成，依赖新列的读写需先等待
+        this.ready = new Promise(resolve => { this._markReady = resolve; });
 
         // 初始化数据库
         this.init();
 
-        // 设置定期清理缓存的定时器 (每30分钟)
-        setInterval(() => this.cleanupStatementCache(), 30 * 60 * 1000);
+        // 设置定期清理缓存的定时器 (每30分钟)，unref 后不会单独阻止进程退出
+        // 清理会释放写事务正在使用的缓存语句，必须在写锁内执行，避免写入中途语句被释放
+        this.statementCacheTimer = setInterval(
+            () => this._withWriteLock(async () => this.cleanupStatementCache()),
+            CONFIG.STATEMENT_CACHE_CLEANUP_INTERVAL
+        );
+        this.statementCacheTimer.unref();
     }
 
     // ==================== 初始化方法 ====================
@@ -98,10 +122,14 @@ class DatabaseManager {
             this.db = new sqlite3.Database(this.dbPath, openMode, (err) => {
                 if (err) {
                     logger.error(`连接数据库失败: ${err.message}`);
+                    this._markReady();
                     throw err;
                 }
                 logger.info(`已连接到数据库: ${this.dbPath} ${this.readOnly ? '(只读模式)' : ''}`);
 
+                // 采集和总结两个进程共用同一数据库文件，被对方锁定时等待而不是立即报 SQLITE_BUSY
+                this.db.configure('busyTimeout', CONFIG.BUSY_TIMEOUT);
+
                 // 配置性能优化PRAGMA
                 this.configurePragmas();
 
@@ -115,6 +143,7 @@ class DatabaseManager {
         } catch (error) {
             logger.error(`初始化数据库失败: ${error.message}`);
             this.db = null;
+            this._markReady();
         }
     }
 
@@ -154,6 +183,7 @@ class DatabaseManager {
                 screen_name TEXT,
                 text TEXT,
                 created_at TEXT,
+                created_at_ms INTEGER,
                 retweet_count INTEGER,
                 like_count INTEGER,
                 reply_count INTEGER,
@@ -166,20 +196,20 @@ class DatabaseManager {
         `, (err) => {
             if (err) {
                 logger.error(`创建tweets表失败: ${err.message}`);
+                this._markReady();
             } else {
                 logger.info('tweets表已创建或已存在');
 
-                // 创建索引以加速查询
-                this.createIndices();
+                // 补齐旧表缺失的列并回填后才放行推文读写，再创建索引以加速查询
+                this.migrateTweetsTable()
+                    .catch(err => logger.error(`迁移tweets表失败: ${err.message}`))
+                    .then(() => {
+                        this._markReady();
+                        this.createIndices();
+                    });
 
                 // 获取总记录数
-                this.db.get("SELECT COUNT(*) as count FROM tweets", (err, row) => {
-                    if (err) {
-                        logger.error(`获取tweets总数失败: ${err.message}`);
-                    } else {
-                        logger.info(`数据库共有 ${row.count} 条推文记录`);
-                    }
-                });
+                this.logTweetCount();
             }
         });
 
@@ -244,6 +274,66 @@ class DatabaseManager {
         });
     }
 
+    /**
+     * 迁移旧版tweets表：添加数值时间戳列 created_at_ms 并回填历史数据
+     *
+     * created_at 为 Twitter 字符串格式（如 "Fri May 09 20:18:10 +0000 2025"），
+     * 无法按字符串排序或范围比较，时间范围查询改用该数值列
+     *
+     * @returns {Promise<void>}
+     * @private
+     */
+    migrateTweetsTable() {
+        return new Promise((resolve, reject) => {
+            this.db.all('PRAGMA table_info(tweets)', (err, columns) => {
+                if (err) return reject(err);
+                if (columns.some(col => col.name === 'created_at_ms')) return resolve();
+
+                this.db.run('ALTER TABLE tweets ADD COLUMN created_at_ms INTEGER', (alterErr) => {
+                    // 另一个进程可能已先完成迁移
+                    if (alterErr && !alterErr.message.includes('duplicate column')) return reject(alterErr);
+                    logger.info('已为tweets表添加 created_at_ms 列');
+                    resolve();
+                });
+            });
+        }).then(() => this._withWriteLock(() => this.backfillCreatedAtMs()));
+    }
+
+    /**
+     * 回填 created_at_ms 为空的历史推文
+     * @returns {Promise<void>}
+     * @private
+     */
+    backfillCreatedAtMs() {
+        return new Promise((resolve, reject) => {
+            this.db.all('SELECT id, created_at FROM tweets WHERE created_at_ms IS NULL', (err, rows) => {
+                if (err) return reject(err);
+                if (rows.length === 0) return resolve();
+
+                logger.info(`开始回填 ${rows.length} 条推文的 created_at_ms...`);
+                const stmt = this.db.prepare('UPDATE tweets SET created_at_ms = ? WHERE id = ?');
+
+                this.db.serialize(() => {
+                    this.db.run('BEGIN TRANSACTION', (beginErr) => {
+                        if (beginErr) logger.error(`回填事务开始失败: ${beginErr.message}`);
+                    });
+                    for (const row of rows) {
+                        const ms = Date.parse(row.created_at);
+                        stmt.run(Number.isNaN(ms) ? null : ms, row.id, (runErr) => {
+                            if (runErr) logger.error(`回填推文 ${row.id} 失败: ${runErr.message}`);
+                        });
+                    }
+                    stmt.finalize();
+                    this.db.run('COMMIT', (commitErr) => {
+                        if (commitErr) return reject(commitErr);
+                        logger.info('created_at_ms 回填完成');
+                        resolve();
+                    });
+                });
+            });
+        });
+    }
+
     /**
      * 创建索引以优化查询性能
      * @private
@@ -258,12 +348,22 @@ class DatabaseManager {
             }
         });
 
-        // 创建时间索引 - 加速时间范围查询
-        this.db.run(`CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON tweets(created_at)`, (err) => {
+        // created_at 为 Twitter 字符串格式，按文本排序无意义，其索引只会拖慢写入；
+        // 时间范围查询已改用 created_at_ms 索引，删除旧索引
+        this.db.run(`DROP INDEX IF EXISTS idx_tweets_created_at`, (err) => {
+            if (err) {
+                logger.error(`删除created_at索引失败: ${err.message}`);
+            } else {
+                logger.debug('已删除无效的created_at索引');
+            }
+        });
+
+        // 数值时间戳索引 - 时间范围查询直接在SQLite中完成过滤和排序
+        this.db.run(`CREATE INDEX IF NOT EXISTS idx_tweets_created_at_ms ON tweets(created_at_ms)`, (err) => {
             if (err) {
-                logger.error(`创建created_at索引失败: ${err.message}`);
+                logger.error(`创建created_at_ms索引失败: ${err.message}`);
             } else {
-                logger.debug('已创建created_at索引');
+                logger.debug('已创建created_at_ms索引');
             }
         });
 
@@ -299,6 +399,9 @@ class DatabaseManager {
      * 验证表结构（只读模式下使用）
      */
     validateTables() {
+        // 只读模式不执行迁移，表结构以写入进程为准
+        this._markReady();
+
         this.db.get("PRAGMA table_info(tweets)", (err, row) => {
             if (err) {
                 logger.error(`检查tweets表结构失败: ${err.message}`);
@@ -308,6 +411,14 @@ class DatabaseManager {
         });
 
         // 获取总记录数
+        this.logTweetCount();
+    }
+
+    /**
+     * 记录推文表的记录数（启动时执行一次，不在热路径上）
+     * @private
+     */
+    logTweetCount() {
         this.db.get("SELECT COUNT(*) as count FROM tweets", (err, row) => {
             if (err) {
                 logger.error(`获取tweets总数失败: ${err.message}`);
@@ -320,10 +431,22 @@ class DatabaseManager {
     // ==================== 连接管理 ====================
 
     /**
-     * 关闭数据库连接并释放资源
+     * 关闭数据库连接并释放资源（先写完队列中的推文）
+     * @returns {Promise<void>} 连接关闭流程发起后完成
      */
-    close() {
+    async close() {
+        clearInterval(this.statementCacheTimer);
+
+        if (this.pendingTweetWrites.length > 0 || this.tweetFlushTask) {
+            logger.info(`关闭数据库前写入队列中的 ${this.pendingTweetCount} 条推文...`);
+            await this._flushTweetWrites();
+        }
+
         if (this.db) {
+            // 先释放缓存的预处理语句，否则 SQLite 会因存在未释放的语句而拒绝关闭；
+            // 在写锁内执行，等待进行中的用户批次等写事务结束
+            await this._withWriteLock(async () => this.cleanupStatementCache());
+
             this.db.close((err) => {
                 if (err) {
                     logger.error(`关闭数据库连接失败: ${err.message}`);
@@ -340,9 +463,13 @@ class DatabaseManager {
      * 获取指定时间范围内的推文数据
      * @param {Date} startTime - 开始时间
      * @param {Date} [endTime=new Date()] - 结束时间（默认当前时间）
+     * @param {string[]} [columns=CONFIG.TWEET_COLUMNS] - 需要返回的列，只读取调用方用到的字段
      * @returns {Promise<Array>} 推文对象数组
      */
-    async getTweetsInTimeRange(startTime, endTime = new Date()) {
+    async getTweetsInTimeRange(startTime, endTime = new Date(), columns = CONFIG.TWEET_COLUMNS) {
+        // 按 created_at_ms 过滤，需等待迁移和回填完成
+        await this.ready;
+
         return new Promise((resolve, reject) => {
             if (!this.db) {
                 logger.error('数据库未连接');
@@ -353,71 +480,34 @@ class DatabaseManager {
             const startMs = startTime.getTime();
             const endMs = endTime.getTime();
 
-            logger.debug(`查询时间范围: ${startTime.toISOString()} 至 ${endTime.toISOString()}`);
-            logger.debug(`时间戳范围: ${startMs} 至 ${endMs}`);
+            // 每次查询都会执行，仅在调试级别开启时才格式化日志
+            if (logger.isLevelEnabled('debug')) {
+                logger.debug(`查询时间范围: ${startTime.toISOString()} 至 ${endTime.toISOString()}`);
+                logger.debug(`时间戳范围: ${startMs} 至 ${endMs}`);
+            }
+
+            // 列名只允许取自白名单，避免拼接任意SQL
+            const selected = columns.filter(column => CONFIG.TWEET_COLUMNS.includes(column));
+            if (selected.length === 0) {
+                return reject(new Error('未指定有效的推文查询列'));
+            }
 
-            // 获取所有推文
+            // 时间范围过滤和排序通过 created_at_ms 索引在SQLite中完成
             const query = `
-                SELECT 
-                    id, 
-                    user_id, 
-                    username, 
-                    screen_name, 
-                    text, 
-                    created_at, 
-                    retweet_count, 
-                    like_count, 
-                    reply_count, 
-                    quote_count,
-                    bookmark_count, 
-                    view_count, 
-                    collected_at, 
-                    media_urls
+                SELECT ${selected.join(', ')}
                 FROM tweets
-                ORDER BY created_at DESC
+                WHERE created_at_ms BETWEEN ? AND ?
+                ORDER BY created_at_ms DESC
             `;
 
-            this.db.all(query, [], (err, rows) => {
+            this.db.all(query, [startMs, endMs], (err, rows) => {
                 if (err) {
                     logger.error(`查询数据库失败: ${err.message}`);
                     return reject(err);
                 }
 
-                logger.info(`从数据库获取到 ${rows.length} 条记录，开始过滤时间范围...`);
-
-                // 输出前5条记录的created_at供调试
-                if (rows.length > 0) {
-                    const sampleDates = rows.slice(0, 5).map(r => r.created_at);
-                    logger.debug(`样本日期格式: ${JSON.stringify(sampleDates)}`);
-                }
-
-                // 过滤指定时间范围内的推文
-                // Twitter的日期格式例如: "Fri May 09 20:18:10 +0000 2025"
-                const filteredRows = rows.filter(row => {
-                    try {
-                        // 直接使用JavaScript Date对象解析Twitter日期格式
-                        const tweetDate = new Date(row.created_at);
-                        const tweetMs = tweetDate.getTime();
-
-                        // 检查是否在时间范围内
-                        const isInRange = tweetMs >= startMs && tweetMs <= endMs;
-
-                        // 为了调试，记录一些日期处理信息
-                        if (rows.indexOf(row) < 5) {
-                            logger.debug(`推文日期: ${row.created_at}`);
-                            logger.debug(`解析为: ${tweetDate.toISOString()}`);
-                            logger.debug(`时间戳: ${tweetMs}, 是否在范围内: ${isInRange}`);
-                        }
-
-                        return isInRange;
-                    } catch (e) {
-                        logger.warn(`无法解析推文日期: ${row.created_at}, 错误: ${e.message}`);
-                        return false;
-                    }
-                });
-
-                logger.info(`时间范围过滤后剩余 ${filteredRows.length} 条推文记录`);
-                resolve(filteredRows);
+                logger.info(`时间范围内共有 ${rows.length} 条推文记录`);
+                resolve(rows);
             });
         });
     }
@@ -426,6 +516,12 @@ class DatabaseManager {
 
     /**
      * 批量保存推文到数据库（支持新增和更新）
+     *
+     * 写入采用组提交：推文先进入待写队列，攒满 WRITE_GROUP_MAX_TWEETS 条或等待
+     * WRITE_FLUSH_INTERVAL 后由单个刷写循环合并到同一个事务中提交，避免每次调用
+     * 各自开启事务导致的冲突和开销。待写队列超过 WRITE_QUEUE_MAX_TWEETS 条时，
+     * 新的调用会先等待当前刷写完成。
+     *
      * @param {Array} tweets - 推文对象数组
      * @returns {Promise<Object>} 统计信息 {new, updated, skipped, error}
      */
@@ -435,229 +531,334 @@ class DatabaseManager {
             return { new: 0, updated: 0, skipped: 0, error: 0 };
         }
 
+        // 缺少必要字段的推文在进入写入队列前直接跳过
+        const validTweets = tweets.filter(tweet => this._isValidTweet(tweet));
+        const invalid = tweets.length - validTweets.length;
+        if (invalid > 0) {
+            logger.debug(`跳过 ${invalid} 条缺少 id/text/created_at 的无效推文`);
+        }
+        if (validTweets.length === 0) {
+            return { new: 0, updated: 0, skipped: invalid, error: 0 };
+        }
+
+        // 背压：磁盘写入跟不上采集时让调用方等待，避免待写队列无限增长
+        while (this.pendingTweetCount >= CONFIG.WRITE_QUEUE_MAX_TWEETS) {
+            logger.warn(`待写队列已有 ${this.pendingTweetCount} 条推文，等待刷写完成后再入队`);
+            await this._flushTweetWrites();
+        }
+
+        return new Promise((resolve, reject) => {
+            this.pendingTweetWrites.push({ tweets: validTweets, invalid, resolve, reject });
+            this.pendingTweetCount += validTweets.length;
+            this._scheduleTweetFlush();
+        });
+    }
+
+    /**
+     * 安排刷写待写队列：攒满一个事务的推文数时立即写入，否则最多等待 WRITE_FLUSH_INTERVAL
+     * @private
+     */
+    _scheduleTweetFlush() {
+        // 正在进行的刷写循环会继续处理新加入的请求
+        if (this.tweetFlushTask) return;
+
+        if (this.pendingTweetCount >= CONFIG.WRITE_GROUP_MAX_TWEETS) {
+            this._flushTweetWrites();
+        } else if (!this.tweetWriteTimer) {
+            this.tweetWriteTimer = setTimeout(() => this._flushTweetWrites(), CONFIG.WRITE_FLUSH_INTERVAL);
+        }
+    }
+
+    /**
+     * 检查推文是否包含写入所需的字段
+     * @param {Object} tweet - 推文对象
+     * @returns {boolean} 是否有效
+     * @private
+     */
+    _isValidTweet(tweet) {
+        return Boolean(tweet && tweet.id && typeof tweet.text === 'string' && tweet.created_at);
+    }
+
+    /**
+     * 立即刷写待写队列，已有刷写任务时复用该任务
+     * @returns {Promise<void>} 队列清空后完成
+     * @private
+     */
+    _flushTweetWrites() {
+        clearTimeout(this.tweetWriteTimer);
+        this.tweetWriteTimer = null;
+
+        if (!this.tweetFlushTask && this.pendingTweetWrites.length > 0) {
+            this.tweetFlushTask = this._drainTweetWrites();
+        }
+        return this.tweetFlushTask || Promise.resolve();
+    }
+
+    /**
+     * 刷写循环：每轮取出若干调用合并为一个事务，直到队列为空
+     * @private
+     */
+    async _drainTweetWrites() {
+        try {
+            // 写入 created_at_ms 列需等待迁移完成；回填也占用写锁，因此在写锁之外等待
+            await this.ready;
+
+            while (this.pendingTweetWrites.length > 0) {
+                // 取出一组请求，单个事务内的推文数量不超过上限（至少取一个请求）
+                const group = [this.pendingTweetWrites.shift()];
+                let groupSize = group[0].tweets.length;
+                while (this.pendingTweetWrites.length > 0 &&
+                    groupSize + this.pendingTweetWrites[0].tweets.length <= CONFIG.WRITE_GROUP_MAX_TWEETS) {
+                    const next = this.pendingTweetWrites.shift();
+                    groupSize += next.tweets.length;
+                    group.push(next);
+                }
+                this.pendingTweetCount -= groupSize;
+
+                if (logger.isLevelEnabled('debug')) {
+                    logger.debug(`组提交: 合并 ${group.length} 个写入请求，共 ${groupSize} 条推文`);
+                }
+
+                try {
+                    const groupStats = await this._withWriteLock(() => this._writeTweetGroup(group.map(request => request.tweets)));
+                    group.forEach((request, i) => {
+                        const stats = groupStats[i];
+                        stats.skipped += request.invalid;
+                        logger.info(`推文保存完成 - 新增: ${stats.new}, 更新: ${stats.updated}, 跳过: ${stats.skipped}, 错误: ${stats.error}`);
+                        request.resolve(stats);
+                    });
+                } catch (error) {
+                    logger.error(`处理批次时出错: ${error.message}`);
+                    group.forEach(request => request.reject(error));
+                }
+            }
+        } finally {
+            this.tweetFlushTask = null;
+        }
+    }
+
+    /**
+     * 在单个事务中写入一组推文
+     * @param {Array<Array>} tweetLists - 每个写入请求的推文数组
+     * @returns {Promise<Array<Object>>} 与请求一一对应的统计信息
+     * @private
+     */
+    _writeTweetGroup(tweetLists) {
         const now = new Date().toISOString();
-        const stats = {
+        const groupStats = tweetLists.map(() => ({
             new: 0,      // 新增的推文
             updated: 0,  // 更新的推文
             skipped: 0,  // 跳过的推文（无变化）
             error: 0     // 处理出错的推文
-        };
+        }));
 
         return new Promise((resolve, reject) => {
-            // 首先将所有推文按批次分组处理
-            const BATCH_SIZE = CONFIG.BATCH_SIZE || 50; // 每批次处理的推文数
-            const batches = [];
-
-            // 分批
-            for (let i = 0; i < tweets.length; i += BATCH_SIZE) {
-                batches.push(tweets.slice(i, i + BATCH_SIZE));
-            }
-
-            logger.debug(`将 ${tweets.length} 条推文分成 ${batches.length} 个批次处理`);
-
-            // 处理单个批次的函数
-            const processBatch = async (batch) => {
-                return new Promise((resolveBatch, rejectBatch) => {
-                    let checkStmt, insertStmt, updateStmt;
+            // 预处理语句从语句缓存获取，在各次写入间复用
+            const checkStmt = this._getCachedStatement('checkTweet',
+                'SELECT id, retweet_count, like_count, reply_count, quote_count, bookmark_count, view_count FROM tweets WHERE id = ?');
+            const insertStmt = this._getCachedStatement('insertTweet', `
+                INSERT INTO tweets (
+                    id, user_id, username, screen_name, text, created_at, created_at_ms,
+                    retweet_count, like_count, reply_count, quote_count,
+                    bookmark_count, view_count, collected_at, media_urls
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            `);
+            const updateStmt = this._getCachedStatement('updateTweet', `
+                UPDATE tweets SET 
+                    retweet_count = ?, 
+                    like_count = ?, 
+                    reply_count = ?, 
+                    quote_count = ?,
+                    bookmark_count = ?, 
+                    view_count = ?, 
+                    collected_at = ?
+                WHERE id = ?
+            `);
 
-                    try {
-                        // 准备语句
-                        checkStmt = this.db.prepare('SELECT id, retweet_count, like_count, reply_count, quote_count, bookmark_count, view_count FROM tweets WHERE id = ?');
-                        insertStmt = this.db.prepare(`
-                            INSERT INTO tweets (
-                                id, user_id, username, screen_name, text, created_at,
-                                retweet_count, like_count, reply_count, quote_count,
-                                bookmark_count, view_count, collected_at, media_urls
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        `);
-                        updateStmt = this.db.prepare(`
-                            UPDATE tweets SET 
-                                retweet_count = ?, 
-                                like_count = ?, 
-                                reply_count = ?, 
-                                quote_count = ?,
-                                bookmark_count = ?, 
-                                view_count = ?, 
-                                collected_at = ?
-                            WHERE id = ?
-                        `);
+            // 保存单条推文（包装在Promise中以避免异常中断整个事务）
+            const saveTweet = (tweet, stats) => new Promise((resolveTweet) => {
+                try {
+                    // 检查推文是否存在
+                    checkStmt.get(tweet.id, (err, existingTweet) => {
+                        if (err) {
+                            logger.error(`检查推文 ${tweet.id} 时出错: ${err.message}`);
+                            stats.error++;
+                            resolveTweet();
+                            return;
+                        }
 
-                        // 开始事务
-                        this.db.run('BEGIN TRANSACTION', async (beginErr) => {
-                            if (beginErr) {
-                                logger.error(`开始事务失败: ${beginErr.message}`);
-                                safeFinalize(checkStmt);
-                                safeFinalize(insertStmt);
-                                safeFinalize(updateStmt);
-                                return rejectBatch(beginErr);
+                        if (existingTweet) {
+                            // 检查是否有变化
+                            const hasChanged =
+                                existingTweet.retweet_count !== tweet.retweet_count ||
+                                existingTweet.like_count !== tweet.like_count ||
+                                existingTweet.reply_count !== tweet.reply_count ||
+                                existingTweet.quote_count !== tweet.quote_count ||
+                                existingTweet.bookmark_count !== tweet.bookmark_count ||
+                                existingTweet.view_count !== tweet.view_count;
+
+                            if (!hasChanged) {
+                                // 跳过
+                                stats.skipped++;
+                                resolveTweet();
+                                return;
                             }
 
-                            try {
-                                // 使用Promise.all处理批次中的所有推文
-                                const processPromises = batch.map(tweet =>
-                                    new Promise((resolveTweet) => {
-                                        // 包装在Promise中以避免异常中断批处理
-                                        try {
-                                            // 检查推文是否存在
-                                            checkStmt.get(tweet.id, (err, existingTweet) => {
-                                                if (err) {
-                                                    logger.error(`检查推文 ${tweet.id} 时出错: ${err.message}`);
-                                                    stats.error++;
-                                                    resolveTweet();
-                                                    return;
-                                                }
-
-                                                if (existingTweet) {
-                                                    // 检查是否有变化
-                                                    const hasChanged =
-                                                        existingTweet.retweet_count !== tweet.retweet_count ||
-                                                        existingTweet.like_count !== tweet.like_count ||
-                                                        existingTweet.reply_count !== tweet.reply_count ||
-                                                        existingTweet.quote_count !== tweet.quote_count ||
-                                                        existingTweet.bookmark_count !== tweet.bookmark_count ||
-                                                        existingTweet.view_count !== tweet.view_count;
-
-                                                    if (hasChanged) {
-                                                        // 更新
-                                                        updateStmt.run(
-                                                            tweet.retweet_count,
-                                                            tweet.like_count,
-                                                            tweet.reply_count,
-                                                            tweet.quote_count,
-                                                            tweet.bookmark_count,
-                                                            tweet.view_count,
-                                                            now,
-                                                            tweet.id,
-                                                            (err) => {
-                                                                if (err) {
-                                                                    logger.error(`更新推文 ${tweet.id} 时出错: ${err.message}`);
-                                                                    stats.error++;
-                                                                } else {
-                                                                    stats.updated++;
-                                                                }
-                                                                resolveTweet();
-                                                            }
-                                                        );
-                                                    } else {
-                                                        // 跳过
-                                                        stats.skipped++;
-                                                        resolveTweet();
-                                                    }
-                                                } else {
-                                                    // 插入
-                                                    insertStmt.run(
-                                                        tweet.id,
-                                                        tweet.user_id,
-                                                        tweet.username,
-                                                        tweet.screen_name,
-                                                        tweet.text,
-                                                        tweet.created_at,
-                                                        tweet.retweet_count,
-                                                        tweet.like_count,
-                                                        tweet.reply_count,
-                                                        tweet.quote_count,
-                                                        tweet.bookmark_count,
-                                                        tweet.view_count,
-                                                        now,
-                                                        tweet.media_urls,
-                                                        (err) => {
-                                                            if (err) {
-                                                                logger.error(`插入推文 ${tweet.id} 时出错: ${err.message}`);
-                                                                stats.error++;
-                                                            } else {
-                                                                stats.new++;
-                                                            }
-                                                            resolveTweet();
-                                                        }
-                                                    );
-                                                }
-                                            });
-                                        } catch (e) {
-                                            logger.error(`处理推文时发生异常: ${e.message}`);
-                                            stats.error++;
-                                            resolveTweet();
-                                        }
-                                    })
-                                );
-
-                                // 等待批次中所有推文处理完成
-                                await Promise.all(processPromises);
-
-                                // 提交事务
-                                this.db.run('COMMIT', (commitErr) => {
-                                    if (commitErr) {
-                                        logger.error(`提交事务失败: ${commitErr.message}`);
-                                        this.db.run('ROLLBACK', () => {
-                                            safeFinalize(checkStmt);
-                                            safeFinalize(insertStmt);
-                                            safeFinalize(updateStmt);
-                                            rejectBatch(commitErr);
-                                        });
+                            // 更新
+                            updateStmt.run(
+                                tweet.retweet_count,
+                                tweet.like_count,
+                                tweet.reply_count,
+                                tweet.quote_count,
+                                tweet.bookmark_count,
+                                tweet.view_count,
+                                now,
+                                tweet.id,
+                                (err) => {
+                                    if (err) {
+                                        logger.error(`更新推文 ${tweet.id} 时出错: ${err.message}`);
+                                        stats.error++;
                                     } else {
-                                        safeFinalize(checkStmt);
-                                        safeFinalize(insertStmt);
-                                        safeFinalize(updateStmt);
-                                        resolveBatch();
+                                        stats.updated++;
                                     }
-                                });
-                            } catch (batchError) {
-                                logger.error(`批处理过程中出错: ${batchError.message}`);
-                                // 回滚事务
-                                this.db.run('ROLLBACK', () => {
-                                    safeFinalize(checkStmt);
-                                    safeFinalize(insertStmt);
-                                    safeFinalize(updateStmt);
-                                    rejectBatch(batchError);
-                                });
-                            }
-                        });
-                    } catch (error) {
-                        logger.error(`批处理初始化出错: ${error.message}`);
-                        safeFinalize(checkStmt);
-                        safeFinalize(insertStmt);
-                        safeFinalize(updateStmt);
-                        rejectBatch(error);
-                    }
-                });
-            };
+                                    resolveTweet();
+                                }
+                            );
+                        } else {
+                            // 插入（同时写入数值时间戳，供时间范围查询使用）
+                            const createdAtMs = Date.parse(tweet.created_at);
+                            insertStmt.run(
+                                tweet.id,
+                                tweet.user_id,
+                                tweet.username,
+                                tweet.screen_name,
+                                tweet.text,
+                                tweet.created_at,
+                                Number.isNaN(createdAtMs) ? null : createdAtMs,
+                                tweet.retweet_count,
+                                tweet.like_count,
+                                tweet.reply_count,
+                                tweet.quote_count,
+                                tweet.bookmark_count,
+                                tweet.view_count,
+                                now,
+                                tweet.media_urls,
+                                (err) => {
+                                    if (err) {
+                                        logger.error(`插入推文 ${tweet.id} 时出错: ${err.message}`);
+                                        stats.error++;
+                                    } else {
+                                        stats.new++;
+                                    }
+                                    resolveTweet();
+                                }
+                            );
+                        }
+                    });
+                } catch (e) {
+                    logger.error(`处理推文时发生异常: ${e.message}`);
+                    stats.error++;
+                    resolveTweet();
+                }
+            });
 
-            // 安全释放语句
-            function safeFinalize(stmt) {
-                if (stmt) {
-                    try {
-                        stmt.finalize();
-                    } catch (e) {
-                        logger.error(`释放语句时出错: ${e.message}`);
-                    }
+            // 开始事务
+            this.db.run('BEGIN TRANSACTION', async (beginErr) => {
+                if (beginErr) {
+                    logger.error(`开始事务失败: ${beginErr.message}`);
+                    return reject(beginErr);
                 }
-            }
 
-            // 依次处理各个批次 - 使用串行处理方式避免事务冲突
-            const processBatches = async () => {
                 try {
-                    // 串行处理每个批次以避免事务冲突
-                    for (let i = 0; i < batches.length; i++) {
-                        const batch = batches[i];
-                        logger.debug(`处理第 ${i + 1}/${batches.length} 批次，包含 ${batch.length} 条推文`);
-                        // 重要: 等待每个批次完成后再处理下一个，避免事务冲突
-                        await processBatch(batch);
-                    }
-
-                    logger.info(`所有批次处理完成 - 新增: ${stats.new}, 更新: ${stats.updated}, 跳过: ${stats.skipped}, 错误: ${stats.error}`);
-                    resolve(stats);
-                } catch (error) {
-                    logger.error(`处理批次时出错: ${error.message}`);
-                    reject(error);
+                    // 等待组内所有推文处理完成
+                    // 同一推文在组内重复出现时（如列表与用户时间线重叠）只写入一次，
+                    // 否则并行的存在性检查会导致重复插入
+                    const seenIds = new Set();
+                    await Promise.all(tweetLists.flatMap((tweets, i) =>
+                        tweets.map(tweet => {
+                            if (seenIds.has(tweet.id)) {
+                                groupStats[i].skipped++;
+                                return null;
+                            }
+                            seenIds.add(tweet.id);
+                            return saveTweet(tweet, groupStats[i]);
+                        })
+                    ));
+
+                    // 提交事务
+                    this.db.run('COMMIT', (commitErr) => {
+                        if (commitErr) {
+                            logger.error(`提交事务失败: ${commitErr.message}`);
+                            this.db.run('ROLLBACK', () => reject(commitErr));
+                        } else {
+                            resolve(groupStats);
+                        }
+                    });
+                } catch (groupError) {
+                    logger.error(`批处理过程中出错: ${groupError.message}`);
+                    // 回滚事务
+                    this.db.run('ROLLBACK', () => reject(groupError));
                 }
-            };
-
-            // 开始处理批次
-            processBatches().catch(reject);
+            });
         });
     }
 
     // ==================== 用户数据管理 ====================
 
+    /**
+     * 在写锁内执行事务任务，前一个事务结束后才开始下一个
+     * @param {Function} task - 返回 Promise 的事务任务
+     * @returns {Promise<*>} 任务结果
+     * @private
+     */
+    _withWriteLock(task) {
+        const run = this.writeLock.then(task);
+        this.writeLock = run.catch(() => {});
+        return run;
+    }
+
+    /**
+     * 在单个事务中批量保存或更新用户信息
+     * 单个用户失败不影响同批其他用户，失败项返回 {error: true, id}
+     * @param {Array<Object>} users - 用户对象数组
+     * @returns {Promise<Array<Object>>} 与输入一一对应的操作结果
+     */
+    async saveUsers(users) {
+        if (!users || users.length === 0) {
+            return [];
+        }
+
+        return this._withWriteLock(() => new Promise((resolve, reject) => {
+            if (!this.db) {
+                logger.error('数据库未连接');
+                return reject(new Error('数据库未连接'));
+            }
+
+            this.db.run('BEGIN TRANSACTION', async (beginErr) => {
+                if (beginErr) {
+                    logger.error(`开始事务失败: ${beginErr.message}`);
+                    return reject(beginErr);
+                }
+
+                const results = await Promise.all(users.map(user =>
+                    this.saveUser(user).catch(() => ({ error: true, id: user.id }))
+                ));
+
+                this.db.run('COMMIT', (commitErr) => {
+                    if (commitErr) {
+                        logger.error(`提交用户批次事务失败: ${commitErr.message}`);
+                        this.db.run('ROLLBACK', () => reject(commitErr));
+                    } else {
+                        if (logger.isLevelEnabled('debug')) {
+                            logger.debug(`用户批次已提交: ${users.length} 个用户`);
+                        }
+                        resolve(results);
+                    }
+                });
+            });
+        }));
+    }
+
     /**
      * 保存或更新用户信息
      * @param {Object} user - 用户对象
@@ -673,11 +874,7 @@ class DatabaseManager {
             const now = new Date().toISOString();
 
             // 从语句缓存中获取预处理语句或创建新的
-            let checkStmt = this.statementCache.get('checkUser');
-            if (!checkStmt) {
-                checkStmt = this.db.prepare('SELECT id FROM users WHERE id = ?');
-                this.statementCache.set('checkUser', checkStmt);
-            }
+            const checkStmt = this._getCachedStatement('checkUser', 'SELECT id FROM users WHERE id = ?');
 
             // 检查用户是否存在
             checkStmt.get(user.id, (err, row) => {
@@ -727,7 +924,10 @@ class DatabaseManager {
                                 logger.error(`更新用户 ${user.id} 时出错: ${err.message}`);
                                 return reject(err);
                             }
-                            logger.debug(`已更新用户: ${user.screen_name || user.id}`);
+                            // 逐个用户执行，仅在调试级别开启时才格式化日志
+                            if (logger.isLevelEnabled('debug')) {
+                                logger.debug(`已更新用户: ${user.screen_name || user.id}`);
+                            }
                             resolve({ updated: true, id: user.id });
                         }
                     );
@@ -764,7 +964,9 @@ class DatabaseManager {
                                 logger.error(`添加用户 ${user.id} 时出错: ${err.message}`);
                                 return reject(err);
                             }
-                            logger.debug(`已添加新用户: ${user.screen_name || user.id}`);
+                            if (logger.isLevelEnabled('debug')) {
+                                logger.debug(`已添加新用户: ${user.screen_name || user.id}`);
+                            }
                             resolve({ inserted: true, id: user.id });
                         }
                     );
@@ -823,42 +1025,24 @@ class DatabaseManager {
                     }
 
                     // 如果数据库中没有用户，则回退到CSV文件
-                    if (!fs.existsSync(CONFIG.USERS_CSV_PATH)) {
-                        logger.warn(`找不到文件: ${CONFIG.USERS_CSV_PATH}，数据库中也没有跟踪用户`);
-                        return;
-                    }
-
-                    const csvContent = fs.readFileSync(CONFIG.USERS_CSV_PATH, 'utf-8');
-                    const lines = csvContent.trim().split('\n');
-
-                    // 跳过标题行，获取所有唯一的用户名
-                    for (let i = 1; i < lines.length; i++) {
-                        const line = lines[i].split(',');
-                        if (line[0]) { // 假设第一列是用户名
-                            usernames.add(line[0].trim());
-                        }
-                    }
-                    logger.info(`从CSV文件加载了 ${usernames.size} 个用户`);
+                    return this._readUsernamesFromCsv(usernames)
+                        .then(() => logger.info(`从CSV文件加载了 ${usernames.size} 个用户`))
+                        .catch(csvErr => {
+                            if (csvErr.code === 'ENOENT') {
+                                logger.warn(`找不到文件: ${CONFIG.USERS_CSV_PATH}，数据库中也没有跟踪用户`);
+                            } else {
+                                logger.error(`读取用户CSV文件出错: ${csvErr.message}`);
+                            }
+                        });
                 })
                 .catch(err => {
                     logger.error(`从数据库加载用户失败，尝试使用CSV: ${err.message}`);
 
                     // 回退到CSV文件
-                    if (!fs.existsSync(CONFIG.USERS_CSV_PATH)) {
-                        logger.error(`找不到文件: ${CONFIG.USERS_CSV_PATH}`);
-                        return;
-                    }
-
-                    const csvContent = fs.readFileSync(CONFIG.USERS_CSV_PATH, 'utf-8');
-                    const lines = csvContent.trim().split('\n');
-
-                    // 跳过标题行，获取所有唯一的用户名
-                    for (let i = 1; i < lines.length; i++) {
-                        const line = lines[i].split(',');
-                        if (line[0]) { // 假设第一列是用户名
-                            usernames.add(line[0].trim());
-                        }
-                    }
+                    return this._readUsernamesFromCsv(usernames)
+                        .catch(csvErr => logger.error(csvErr.code === 'ENOENT'
+                            ? `找不到文件: ${CONFIG.USERS_CSV_PATH}`
+                            : `读取用户CSV文件出错: ${csvErr.message}`));
                 });
         } catch (error) {
             logger.error(`读取用户列表出错: ${error.message}`);
@@ -867,6 +1051,26 @@ class DatabaseManager {
         return usernames;
     }
 
+    /**
+     * 从用户CSV文件读取用户名（第一列）到集合中
+     * 使用异步读取，不阻塞事件循环；文件不存在时以 ENOENT 错误拒绝
+     * @param {Set<string>} usernames - 目标用户名集合
+     * @returns {Promise<void>}
+     * @private
+     */
+    async _readUsernamesFromCsv(usernames) {
+        const csvContent = await fs.promises.readFile(CONFIG.USERS_CSV_PATH, 'utf-8');
+        const lines = csvContent.trim().split('\n');
+
+        // 跳过标题行，获取所有唯一的用户名
+        for (let i = 1; i < lines.length; i++) {
+            const line = lines[i].split(',');
+            if (line[0]) { // 假设第一列是用户名
+                usernames.add(line[0].trim());
+            }
+        }
+    }
+
     /**
      * 获取数据库中的所有用户
      * @returns {Promise<Array>} 用户对象数组
@@ -910,6 +1114,22 @@ class DatabaseManager {
 
     // ==================== 缓存管理 ====================
 
+    /**
+     * 从语句缓存中获取预处理语句，不存在时创建并缓存
+     * @param {string} key - 缓存键
+     * @param {string} sql - SQL 语句
+     * @returns {sqlite3.Statement} 预处理语句
+     * @private
+     */
+    _getCachedStatement(key, sql) {
+        let stmt = this.statementCache.get(key);
+        if (!stmt) {
+            stmt = this.db.prepare(sql);
+            this.statementCache.set(key, stmt);
+        }
+        return stmt;
+    }
+
     /**
      * 清理预处理语句缓存（释放内存）
      * @private
@@ -1024,7 +1244,7 @@ class DatabaseManager {
                     return resolve(null);
                 }
 
-                logger.info(`获取到${period}最新总结 (ID: ${row.id}, 创建时间: ${row.created_at})`);
+                logger.debug(`获取到${period}最新总结 (ID: ${row.id}, 创建时间: ${row.created_at})`);
                 resolve(row);
             });
         });
@@ -1035,7 +1255,7 @@ class DatabaseManager {
      * @param {string} period - 时间段 (1hour, 12hours, 1day)
      * @param {number} limit - 限制返回数量
      * @param {number} offset - 起始偏移量，用于分页
-     * @returns {Promise<Array>} 总结对象数组
+     * @returns {Promise<Array>} 总结元数据数组（不含正文，正文通过 getSummaryById 获取）
      */
     async getSummaryHistory(period, limit = 10, offset = 0) {
         return new Promise((resolve, reject) => {
@@ -1044,9 +1264,10 @@ class DatabaseManager {
                 return reject(new Error('数据库未连接'));
             }
 
+            // 历史列表只展示元数据，不读取体积较大的 content 列
             this.db.all(`
                 SELECT 
-                    id, period, content, start_time, end_time, 
+                    id, period, start_time, end_time, 
                     tweet_count, created_at, status
                 FROM summaries
                 WHERE period = ?
@@ -1058,7 +1279,7 @@ class DatabaseManager {
                     return reject(err);
                 }
 
-                logger.info(`获取到${rows.length}条${period}总结历史记录 (limit=${limit}, offset=${offset})`);
+                logger.debug(`获取到${rows.length}条${period}总结历史记录 (limit=${limit}, offset=${offset})`);
                 resolve(rows);
             });
         });
@@ -1093,11 +1314,47 @@ class DatabaseManager {
                     return resolve(null);
                 }
 
-                logger.info(`获取到ID为${id}的总结记录`);
+                logger.debug(`获取到ID为${id}的总结记录`);
                 resolve(row);
             });
         });
     }
+
+    /**
+     * 获取完全落在指定时间范围内的某时间段总结（成功或空数据）
+     * @param {string} period - 时间段标识
+     * @param {Date} startTime - 开始时间
+     * @param {Date} endTime - 结束时间
+     * @returns {Promise<Array>} 按开始时间升序、同一开始时间内按生成时间降序的总结数组
+     */
+    async getSummariesInRange(period, startTime, endTime) {
+        return new Promise((resolve, reject) => {
+            if (!this.db) {
+                logger.error('数据库未连接');
+                return reject(new Error('数据库未连接'));
+            }
+
+            this.db.all(`
+                SELECT 
+                    id, period, content, start_time, end_time, 
+                    tweet_count, created_at, status
+                FROM summaries
+                WHERE period = ?
+                    AND start_time >= ?
+                    AND end_time <= ?
+                    AND status IN ('success', 'empty')
+                ORDER BY start_time ASC, created_at DESC
+            `, [period, startTime.toISOString(), endTime.toISOString()], (err, rows) => {
+                if (err) {
+                    logger.error(`获取${period}时间范围内的总结失败: ${err.message}`);
+                    return reject(err);
+                }
+
+                logger.debug(`获取到${rows.length}条时间范围内的${period}总结`);
+                resolve(rows);
+            });
+        });
+    }
 }
 
 // ==================== 模块导出 ====================
@@ -17,16 +17,132 @@ require('dotenv').config();
 const express = require('express');
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
+const https = require('https');
 const schedule = require('node-schedule');
 const OpenAI = require('openai');
-const TelegramBot = require('node-telegram-bot-api');
 
 const { createLogger } = require('./logger');
 const { DatabaseManager } = require('./data');
-const { SYSTEM_PROMPT, AI_CONFIG } = require('./config');
+const { SYSTEM_PROMPT, USER_PROMPT_INSTRUCTIONS, AI_CONFIG } = require('./config');
 
 const logger = createLogger('summary');
 
+/**
+ * 各总结时间段的元数据：时长（小时）和中文名称
+ * 新增时间段只需在此添加一项
+ * @constant {Object}
+ */
+const PERIOD_META = Object.freeze({
+    '1hour': Object.freeze({ hours: 1, label: '1小时' }),
+    '12hours': Object.freeze({ hours: 12, label: '12小时' }),
+    '1day': Object.freeze({ hours: 24, label: '24小时' })
+});
+
+/**
+ * 支持的总结时间段
+ * @constant {string[]}
+ */
+const VALID_PERIODS = Object.keys(PERIOD_META);
+
+/**
+ * 分层总结：较长时间段优先基于下级时间段的已有总结生成
+ * @constant {Object}
+ */
+const SUMMARY_HIERARCHY = {
+    '12hours': '1hour',
+    '1day': '12hours'
+};
+
+/**
+ * 生成总结时需要从数据库读取的推文列
+ * @constant {string[]}
+ */
+const SUMMARY_TWEET_COLUMNS = [
+    'id', 'username', 'screen_name', 'text', 'created_at', 'created_at_ms',
+    'retweet_count', 'like_count', 'reply_count', 'media_urls'
+];
+
+/**
+ * 提示词中推文之间的分隔线
+ * @constant {string}
+ */
+const TWEET_SEPARATOR = '='.repeat(30);
+
+/**
+ * AI 请求的系统消息（各次调用共享同一对象）
+ * @constant {Object}
+ */
+const SYSTEM_MESSAGE = Object.freeze({ role: 'system', content: SYSTEM_PROMPT });
+
+/**
+ * 总结来源标记对应的中文标签
+ * @constant {Object}
+ */
+const TRIGGER_LABELS = Object.freeze({
+    startup: '启动',
+    cron: '定时',
+    manual: '手动',
+    auto: '自动'
+});
+
+/**
+ * Telegram 文本转换使用的合并正则（各分支见 _formatSummaryForTelegram）
+ * @constant {RegExp}
+ */
+const TELEGRAM_MARKUP_PATTERN =
+    /(```[\s\S]*?```|<script[\s\S]*?<\/script>|<style[\s\S]*?<\/style>)|(<li[^>]*>)|(<br\s*\/?>|<\/?(?:div|span|p)>)|(&nbsp;)|<\/?ol[^>]*>|<\/li>/gi;
+
+/**
+ * Telegram 推送的固定选项（各次发送共享同一对象）
+ * @constant {Object}
+ */
+const TELEGRAM_SEND_OPTIONS = Object.freeze({
+    parse_mode: 'HTML',
+    disable_web_page_preview: false
+});
+
+/**
+ * Telegram Bot API 请求超时（毫秒）
+ * @constant {number}
+ */
+const TELEGRAM_REQUEST_TIMEOUT = 15000;
+
+/**
+ * Telegram 单条消息长度上限（官方上限约4096字符，预留余量，超出时拆分发送）
+ * @constant {number}
+ */
+const TELEGRAM_MAX_MESSAGE_LENGTH = 3900;
+
+/**
+ * 总结服务配置
+ * @constant {Object}
+ */
+const SUMMARY_CONFIG = {
+    AI_CACHE_MAX_ENTRIES: 50,               // AI 响应缓存条目上限
+    AI_CACHE_TTL: 6 * 60 * 60 * 1000,       // AI 响应缓存有效期（6小时）
+    MAX_PROMPT_TWEETS: 400,                 // 单次提示词最多包含的推文数
+    PROMPT_TAIL_TWEETS: 100,                // 超限时原样保留的最新推文数
+    MAX_TWEET_TEXT_LENGTH: 600,             // 单条推文正文截断长度（字符）
+    MIN_TWEETS_FOR_AI: 3                    // 推文少于该数量时直接套用模板，不调用AI
+};
+
+// ==================== HTML 工具函数 ====================
+
+/**
+ * 转义嵌入HTML正文或属性值的文本
+ * @param {*} text - 原始文本
+ * @returns {string} 转义后的文本
+ */
+function escapeHtml(text) {
+    return String(text ?? '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
 // ==================== 时间工具函数 ====================
 
 /**
@@ -61,12 +177,8 @@ const TimeUtil = {
      * @returns {number} 毫秒数
      */
     getTimeDeltaForPeriod(period) {
-        const timeDelta = {
-            '1hour': 60 * 60 * 1000,
-            '12hours': 12 * 60 * 60 * 1000,
-            '1day': 24 * 60 * 60 * 1000
-        };
-        return timeDelta[period] || timeDelta['1hour'];
+        const meta = PERIOD_META[period] || PERIOD_META['1hour'];
+        return meta.hours * 60 * 60 * 1000;
     },
 
     /**
@@ -85,35 +197,16 @@ const TimeUtil = {
             lastHour.setHours(lastHour.getHours() - 1);
         }
 
-        // 计算开始时间和结束时间
-        let queryStart, queryEnd;
-
-        if (period === '1hour') {
-            // 计算"上上个整点"作为开始时间
-            queryEnd = new Date(lastHour); // 上一个整点作为结束时间
-            queryStart = new Date(lastHour);
-            queryStart.setHours(queryStart.getHours() - 1); // 上上个整点作为开始时间
-
-            logger.info(`1小时范围：从${queryStart.toLocaleString()}到${queryEnd.toLocaleString()}`);
-        } else if (period === '12hours') {
-            // 计算12小时前的整点作为开始时间
-            queryEnd = new Date(lastHour); // 上一个整点作为结束时间
-            queryStart = new Date(lastHour);
-            queryStart.setHours(queryStart.getHours() - 12); // 往前推12个整点小时
-
-            logger.info(`12小时范围：从${queryStart.toLocaleString()}到${queryEnd.toLocaleString()}`);
-        } else if (period === '1day') {
-            // 计算24小时前的整点作为开始时间
-            queryEnd = new Date(lastHour); // 上一个整点作为结束时间
-            queryStart = new Date(lastHour);
-            queryStart.setHours(queryStart.getHours() - 24); // 往前推24个整点小时
-
-            logger.info(`24小时范围：从${queryStart.toLocaleString()}到${queryEnd.toLocaleString()}`);
+        // 上一个整点作为结束时间，往前推该时间段的整点小时数作为开始时间
+        const queryEnd = new Date(lastHour);
+        const queryStart = new Date(lastHour);
+        const meta = PERIOD_META[period];
+        if (meta) {
+            queryStart.setHours(queryStart.getHours() - meta.hours);
+            logger.info(`${meta.label}范围：从${queryStart.toLocaleString()}到${queryEnd.toLocaleString()}`);
         } else {
-            // 默认情况：使用传统的相对时间计算
-            const timeDelta = this.getTimeDeltaForPeriod(period);
-            queryEnd = new Date(lastHour);
-            queryStart = new Date(lastHour.getTime() - timeDelta);
+            // 未知时间段：使用默认时长
+            queryStart.setTime(lastHour.getTime() - this.getTimeDeltaForPeriod(period));
         }
 
         // 创建北京时间版本（UTC+8）
@@ -203,11 +296,8 @@ class TwitterSummarizer {
         this._initializeDatabase();
         this._initializeTelegramBot();
         this.throttler = new RequestThrottler(1);
-        this.lastSummaryTime = {
-            '1hour': new Date(),
-            '12hours': new Date(),
-            '1day': new Date()
-        };
+        this.aiResponseCache = new Map(); // 缓存键 -> {content, createdAt}
+        this.inFlightSummaries = new Map(); // 时间段 -> 正在进行的生成任务
         this.scheduleJobs();
     }
 
@@ -263,12 +353,15 @@ class TwitterSummarizer {
         const chatId = process.env.TELEGRAM_CHAT_ID;
 
         if (token && chatId) {
-            this.telegramBot = new TelegramBot(token, { polling: false });
+            // 进程内唯一的 keep-alive 连接，所有推送复用与 api.telegram.org 的同一条 TCP/TLS 连接
+            this.telegramAgent = new https.Agent({ keepAlive: true, maxSockets: 1 });
+            this.telegramToken = token;
             this.telegramChatId = chatId;
+            this.telegramSendChain = Promise.resolve(); // 推送按顺序串行发送
             logger.info('Telegram Bot 已初始化，将在生成总结后推送');
         } else {
             logger.warn('未配置 TELEGRAM_BOT_TOKEN 或 TELEGRAM_CHAT_ID，跳过 Telegram 推送');
-            this.telegramBot = null;
+            this.telegramToken = null;
             this.telegramChatId = null;
         }
     }
@@ -277,24 +370,24 @@ class TwitterSummarizer {
 
     /**
      * 设置定时任务（使用 node-schedule）
+     *
+     * 只注册一个每小时x:10触发的任务，按当前小时决定要生成的时间段，
+     * 避免0:10和12:10时多个定时器同时唤醒并争抢节流器：
+     * - 每小时生成1小时总结（例如1:10, 2:10, 3:10...）
+     * - 每天0:10和12:10生成12小时总结
+     * - 每天0:10生成1天总结
      */
     scheduleJobs() {
-        // 每小时在x:10分时生成1小时总结（例如1:10, 2:10, 3:10...）
-        schedule.scheduleJob('10 * * * *', async () => {
-            logger.info('执行定时任务: 生成1小时总结');
-            await this.generateAndSaveSummary('1hour', { trigger: 'cron' });
-        });
-
-        // 每12小时在x:10分时生成12小时总结 (每天0:10和12:10)
-        schedule.scheduleJob('10 0,12 * * *', async () => {
-            logger.info('执行定时任务: 生成12小时总结');
-            await this.generateAndSaveSummary('12hours', { trigger: 'cron' });
-        });
-
-        // 每24小时在0:10生成1天总结 (每天0:10)
-        schedule.scheduleJob('10 0 * * *', async () => {
-            logger.info('执行定时任务: 生成1天总结');
-            await this.generateAndSaveSummary('1day', { trigger: 'cron' });
+        schedule.scheduleJob('10 * * * *', async (fireDate) => {
+            const hour = (fireDate || new Date()).getHours();
+            const periods = ['1hour'];
+            if (hour === 0 || hour === 12) periods.push('12hours');
+            if (hour === 0) periods.push('1day');
+
+            for (const period of periods) {
+                logger.info(`执行定时任务: 生成${period}总结`);
+                await this.generateAndSaveSummary(period, { trigger: 'cron' });
+            }
         });
 
         logger.info('已设置定时总结任务');
@@ -304,10 +397,36 @@ class TwitterSummarizer {
 
     /**
      * 生成并保存总结（主要入口方法）
+     *
+     * 同一时间段已有生成任务在进行时，直接复用该任务的结果，
+     * 避免并发的Web请求和定时任务重复排队调用AI。
+     *
+     * @param {string} period - 时间段标识
+     * @param {Object} [options={}] - 生成选项
+     * @param {string} [options.trigger='auto'] - 触发来源（startup/cron/manual/auto）
+     * @returns {Promise<Object|null>} 总结对象或 null
+     */
+    generateAndSaveSummary(period, options = {}) {
+        const inFlight = this.inFlightSummaries.get(period);
+        if (inFlight) {
+            logger.info(`${period}总结正在生成中，复用进行中的任务`);
+            return inFlight;
+        }
+
+        const task = this._runSummaryGeneration(period, options)
+            .finally(() => this.inFlightSummaries.delete(period));
+        this.inFlightSummaries.set(period, task);
+        return task;
+    }
+
+    /**
+     * 执行一次总结生成和保存
      * @param {string} period - 时间段标识
+     * @param {Object} options - 生成选项
      * @returns {Promise<Object|null>} 总结对象或 null
+     * @private
      */
-    async generateAndSaveSummary(period, options = {}) {
+    async _runSummaryGeneration(period, options) {
         const canProceed = await this.throttler.acquireRequest();
         if (!canProceed) {
             logger.warn(`自动总结被拒绝：当前有其他总结正在进行中`);
@@ -324,15 +443,31 @@ class TwitterSummarizer {
             const queryStart = timeRange.start;
             const queryEnd = timeRange.end;
 
-            const tweets = await this.db.getTweetsInTimeRange(queryStart, queryEnd);
+            // 下级总结完整覆盖时间范围时基于其生成，否则回退为读取原始推文
+            const childSummaries = await this._getChildSummaries(period, timeRange);
+            let tweets = null;
+            let tweetCount;
+            if (childSummaries) {
+                tweetCount = childSummaries.tweetCount;
+            } else {
+                tweets = await this.db.getTweetsInTimeRange(queryStart, queryEnd, SUMMARY_TWEET_COLUMNS);
+                tweetCount = tweets ? tweets.length : 0;
+            }
 
-            if (!tweets || tweets.length === 0) {
+            if (tweetCount === 0) {
                 logger.warn(`没有找到${period}内的推文数据，跳过总结生成`);
                 await this._saveEmptySummary(period, queryStart, queryEnd);
                 return null;
             }
 
-            const summary = await this.generateSummary(period);
+            // 复用已查询的数据和时间范围，避免重复查询数据库
+            // 手动刷新需要重新生成，不使用缓存
+            const summary = await this.generateSummary(period, {
+                tweets,
+                childSummaries: childSummaries && childSummaries.summaries,
+                timeRange,
+                useCache: trigger !== 'manual'
+            });
 
             // 额外确保清理内容中的代码块标记
             let cleanedSummary = summary;
@@ -350,16 +485,13 @@ class TwitterSummarizer {
                 cleanedSummary,
                 queryStart,
                 queryEnd,
-                tweets.length,
+                tweetCount,
                 'success'
             );
 
-            // 推送到 Telegram（若已配置）
-            try {
-                await this._sendTelegramSummary(period, timeRange.beijingTimeRange, cleanedSummary, tweets.length, trigger);
-            } catch (tgErr) {
-                logger.warn(`Telegram 推送失败: ${tgErr.message}`);
-            }
+            // 推送到 Telegram（若已配置），不阻塞总结流程和节流器
+            this._sendTelegramSummary(period, timeRange.beijingTimeRange, cleanedSummary, tweetCount, trigger)
+                .catch(tgErr => logger.warn(`Telegram 推送失败: ${tgErr.message}`));
 
             logger.info(`${period}总结已成功生成并保存到数据库 (ID: ${result.id})`);
             return result;
@@ -372,6 +504,70 @@ class TwitterSummarizer {
         }
     }
 
+    /**
+     * 获取完整覆盖时间范围的下级时间段总结
+     * @param {string} period - 时间段标识
+     * @param {Object} timeRange - 时间范围对象
+     * @returns {Promise<Object|null>} {summaries, tweetCount}，无下级时间段或未完整覆盖时返回 null
+     * @private
+     */
+    async _getChildSummaries(period, timeRange) {
+        const childPeriod = SUMMARY_HIERARCHY[period];
+        if (!childPeriod) return null;
+
+        try {
+            const rows = await this.db.getSummariesInRange(childPeriod, timeRange.start, timeRange.end);
+
+            // 同一时段可能有多份总结（启动/手动重新生成），只保留最新的一份
+            const latestByStart = new Map();
+            for (const row of rows) {
+                if (!latestByStart.has(row.start_time)) latestByStart.set(row.start_time, row);
+            }
+
+            // 要求下级总结首尾相接地铺满整个时间范围
+            const childMs = TimeUtil.getTimeDeltaForPeriod(childPeriod);
+            const endMs = timeRange.end.getTime();
+            const children = [];
+            for (let slotMs = timeRange.start.getTime(); slotMs < endMs; slotMs += childMs) {
+                const row = latestByStart.get(new Date(slotMs).toISOString());
+                if (!row || Date.parse(row.end_time) !== slotMs + childMs) {
+                    logger.info(`${childPeriod}总结未完整覆盖${period}时间范围，回退为基于原始推文生成`);
+                    return null;
+                }
+                children.push(row);
+            }
+
+            // 任一下级总结不是有效内容（如旧版本以成功状态保存的错误信息）时，该时段需重新读取原始推文
+            const invalid = children.find(row => !this._isUsableChildSummary(row));
+            if (invalid) {
+                logger.info(`${childPeriod}总结 (ID: ${invalid.id}) 不是有效总结，回退为基于原始推文生成${period}总结`);
+                return null;
+            }
+
+            logger.info(`${period}总结将基于${children.length}份${childPeriod}总结生成`);
+            return {
+                summaries: children.filter(row => row.status === 'success'),
+                tweetCount: children.reduce((sum, row) => sum + (row.tweet_count || 0), 0)
+            };
+        } catch (error) {
+            logger.warn(`获取${childPeriod}总结失败，回退为基于原始推文生成: ${error.message}`);
+            return null;
+        }
+    }
+
+    /**
+     * 判断下级总结能否作为上级总结的输入
+     * @param {Object} row - 总结记录
+     * @returns {boolean} 是否为有效的成功或空数据总结
+     * @private
+     */
+    _isUsableChildSummary(row) {
+        if (row.status === 'empty') return true;
+        return row.status === 'success' &&
+            typeof row.content === 'string' &&
+            !row.content.includes('class="error-message"');
+    }
+
     /**
      * 保存空数据总结到数据库
      * @param {string} period - 时间段
@@ -382,7 +578,7 @@ class TwitterSummarizer {
     async _saveEmptySummary(period, queryStart, queryEnd) {
         await this.db.saveSummary(
             period,
-            `<div class="no-data-message"><h3>📭 没有新数据</h3><p>在过去${period}内没有发现新的推文活动</p></div>`,
+            this._getNoDataHtml(period),
             queryStart,
             queryEnd,
             0,
@@ -403,7 +599,7 @@ class TwitterSummarizer {
 
             await this.db.saveSummary(
                 period,
-                `<div class="error-message"><h3>❌ 生成总结时出错</h3><p>${error.message}</p></div>`,
+                this._getErrorHtml(error.message),
                 timeRange.start,
                 timeRange.end,
                 0,
@@ -414,38 +610,6 @@ class TwitterSummarizer {
         }
     }
 
-    /**
-     * 获取时间段内的推文数据
-     * @param {string} period - 时间段标识
-     * @returns {Promise<Array>} 推文对象数组
-     */
-    async getPeriodData(period) {
-        // 使用TimeUtil计算时间范围
-        const timeRange = TimeUtil.calculateTimeRange(period);
-        const queryStart = timeRange.start;
-        const queryEnd = timeRange.end;
-
-        logger.info(`开始查询${period}的推文数据 (${timeRange.startFormatted} 至 ${timeRange.endFormatted})`);
-        logger.info(`时间范围: 从 ${queryStart.toLocaleString()} 到 ${queryEnd.toLocaleString()}`);
-
-        try {
-            if (!this.db) {
-                logger.error('数据库未初始化，无法获取数据');
-                return [];
-            }
-
-            logger.info(`正在从数据库获取时间范围内的推文...`);
-            const tweets = await this.db.getTweetsInTimeRange(queryStart, queryEnd);
-
-            this._logTweetResults(tweets, period);
-            this.lastSummaryTime[period] = new Date();
-            return tweets;
-        } catch (error) {
-            logger.error(`获取${period}数据时出错:`, error);
-            return [];
-        }
-    }
-
     /**
      * 将HTML总结格式化为适合Telegram的文本（保留链接，去除列表标签）
      * @param {string} content
@@ -455,27 +619,15 @@ class TwitterSummarizer {
     _formatSummaryForTelegram(content) {
         if (!content || typeof content !== 'string') return '';
 
-        let text = content;
-
-        // 去掉代码块和样式脚本
-        text = text.replace(/```[\s\S]*?```/g, '');
-        text = text.replace(/<script[\s\S]*?<\/script>/gi, '');
-        text = text.replace(/<style[\s\S]*?<\/style>/gi, '');
-
-        // 将列表转换为简单行文本
-        text = text.replace(/<ol[^>]*>/gi, '');
-        text = text.replace(/<\/ol>/gi, '');
-        text = text.replace(/<li[^>]*>/gi, '\n• ');
-        text = text.replace(/<\/li>/gi, '');
-
-        // 保留链接但去掉无用换行
-        text = text.replace(/<br\s*\/?>/gi, '\n');
-
-        // 其他标签简单移除
-        text = text.replace(/<\/?(div|span|p)>/gi, '\n');
-        text = text.replace(/&nbsp;/g, ' ');
-
-        return text.trim();
+        // 单次遍历完成所有标签替换：
+        // 代码块、样式和脚本整体去掉；列表容器去掉，列表项转为 "• " 行；
+        // 换行标签及 div/span/p 转为换行；&nbsp; 转为空格；链接等其他标签保留
+        return content.replace(TELEGRAM_MARKUP_PATTERN, (match, block, listItem, lineBreak, nbsp) => {
+            if (listItem) return '\n• ';
+            if (lineBreak) return '\n';
+            if (nbsp) return ' ';
+            return '';
+        }).trim();
     }
 
     /**
@@ -488,107 +640,265 @@ class TwitterSummarizer {
      * @private
      */
     async _sendTelegramSummary(period, timeRange, summaryHtml, tweetCount, trigger = 'auto') {
-        if (!this.telegramBot || !this.telegramChatId) return;
+        if (!this.telegramToken || !this.telegramChatId) return;
         // 仅推送1小时总结
         if (period !== '1hour') return;
 
-        const triggerLabelMap = {
-            startup: '启动',
-            cron: '定时',
-            manual: '手动',
-            auto: '自动'
-        };
-        const label = triggerLabelMap[trigger] || trigger;
+        const label = TRIGGER_LABELS[trigger] || trigger;
 
-        const header = `<b>1小时总结</b> (${timeRange} 北京时间, ${label})\n数据量: ${tweetCount || 0} 条`;
-        const body = this._formatSummaryForTelegram(summaryHtml);
-        let message = `${header}\n${body}`;
+        const message = `<b>${PERIOD_META[period].label}总结</b> (${timeRange} 北京时间, ${label})\n数据量: ${tweetCount || 0} 条\n` +
+            this._formatSummaryForTelegram(summaryHtml);
 
-        // Telegram消息长度上限约4096字符，预留余量
-        if (message.length > 3900) {
-            message = message.slice(0, 3900) + '\n...（内容过长已截断）';
-        }
+        // 超出单条上限时按行拆分为多条依次发送，而不是截断或被 Telegram 拒绝
+        const parts = this._splitTelegramMessage(message, TELEGRAM_MAX_MESSAGE_LENGTH - 20);
+        const texts = parts.length > 1
+            ? parts.map((part, i) => `<b>(${i + 1}/${parts.length})</b>\n${part}`)
+            : parts;
 
-        await this.telegramBot.sendMessage(this.telegramChatId, message, {
-            parse_mode: 'HTML',
-            disable_web_page_preview: false
+        // 排在之前的推送之后发送，保证顺序且不会为并发推送新建连接
+        const send = this.telegramSendChain.then(async () => {
+            for (const text of texts) {
+                await this._callTelegramApi('sendMessage', {
+                    chat_id: this.telegramChatId,
+                    text,
+                    ...TELEGRAM_SEND_OPTIONS
+                });
+            }
         });
+        this.telegramSendChain = send.catch(() => {});
+        await send;
     }
 
     /**
-     * 输出推文结果日志
-     * @param {Array} tweets - 推文数组
-     * @param {string} period - 时间段
+     * 将消息拆分为不超过长度上限的若干段
+     *
+     * - 优先在换行处切分；单行超长时只在标签、实体或文字之间切分，不会切开标签或实体
+     * - 切分处仍未闭合的标签在本段末尾闭合，并在下一段开头重新打开
+     * - 单行中无法安全切分时（如单个标签本身超长），该行及之后的内容去除标签后按纯文本切分
+     *
+     * @param {string} text - 完整消息（Telegram HTML）
+     * @param {number} limit - 每段最大长度
+     * @returns {Array<string>} 消息分段，每段都是完整的 HTML
      * @private
      */
-    _logTweetResults(tweets, period) {
-        if (tweets.length === 0) {
-            logger.warn(`未找到指定时间范围内的推文数据 (${period})`);
-        } else {
-            logger.info(`获取到 ${tweets.length} 条推文，时间范围: ${period}`);
-            this._logSampleTweets(tweets);
+    _splitTelegramMessage(text, limit) {
+        if (text.length <= limit) return [text];
+
+        const parts = [];
+        let current = '';
+        let openTags = [];  // 当前段末尾尚未闭合的标签 {name, open}
+
+        const reopenTags = () => openTags.map(tag => tag.open).join('');
+        const closeTags = tags => tags.map(tag => `</${tag.name}>`).reverse().join('');
+        const atPartStart = () => current === reopenTags();
+        const fits = unit =>
+            current.length + unit.length + closeTags(this._trackOpenTags(openTags, unit)).length <= limit;
+        const add = unit => {
+            openTags = this._trackOpenTags(openTags, unit);
+            current += unit;
+        };
+        const flush = () => {
+            parts.push(current + closeTags(openTags));
+            current = reopenTags();
+        };
+
+        // 逐个追加单元，放不下时先结束当前段；返回 false 表示单元即使在新段开头也放不下
+        const addUnits = units => {
+            for (const unit of units) {
+                if (!fits(unit)) {
+                    if (!atPartStart()) flush();
+                    if (fits(unit)) {
+                        add(unit);
+                        continue;
+                    }
+                    // 纯文字按字符切分（以码点为单位，不拆开代理对）
+                    if (unit[0] === '<' || unit[0] === '&') return false;
+                    for (const char of unit) {
+                        if (!fits(char)) {
+                            if (atPartStart()) return false;
+                            flush();
+                            if (!fits(char)) return false;
+                        }
+                        add(char);
+                    }
+                    continue;
+                }
+                add(unit);
+            }
+            return true;
+        };
+
+        const tokenize = line => line.match(/<[^>]*>|&#?\w+;|[^<&]+|[<&]/g) || [];
+
+        let plainText = false;  // 出现无法安全切分的行后，其余内容均按纯文本处理
+        for (const rawLine of text.split('\n')) {
+            const line = plainText ? rawLine.replace(/<[^>]*>/g, '') : rawLine;
+            const unit = atPartStart() ? line : `\n${line}`;
+            if (fits(unit)) {
+                add(unit);
+                continue;
+            }
+            if (!atPartStart()) flush();
+            if (fits(line)) {
+                add(line);
+                continue;
+            }
+
+            // 单行超长：记录状态，安全切分失败时回滚
+            const saved = { partCount: parts.length, current, openTags };
+            if (!addUnits(tokenize(line))) {
+                parts.length = saved.partCount;
+                current = saved.current;
+                openTags = saved.openTags;
+
+                // 去除该行及之后所有内容的标签，否则之后各行的闭合标签会失去对应的开始标签；
+                // 此前已打开的标签在当前段末尾闭合，之后不再重新打开
+                if (!atPartStart()) flush();
+                openTags = [];
+                current = '';
+                plainText = true;
+                addUnits(tokenize(line.replace(/<[^>]*>/g, '')));
+            }
         }
+        if (!atPartStart()) flush();
+        return parts;
     }
 
     /**
-     * 输出示例推文日志
-     * @param {Array} tweets - 推文数组
+     * 计算追加一段 HTML 后仍未闭合的标签
+     * @param {Array<Object>} openTags - 追加前未闭合的标签 {name, open}
+     * @param {string} fragment - 追加的 HTML 片段
+     * @returns {Array<Object>} 追加后未闭合的标签
      * @private
      */
-    _logSampleTweets(tweets) {
-        const sampleCount = Math.min(tweets.length, 3);
-        for (let i = 0; i < sampleCount; i++) {
-            const tweet = tweets[i];
-            logger.debug(`示例推文 #${i + 1}:`);
-            logger.debug(`  用户: ${tweet.username} (@${tweet.screen_name})`);
-            logger.debug(`  时间: ${tweet.created_at}`);
-            logger.debug(`  内容: ${tweet.text.substring(0, 50)}...`);
-            logger.debug(`  交互: 👍${tweet.like_count} 🔁${tweet.retweet_count} 💬${tweet.reply_count}`);
+    _trackOpenTags(openTags, fragment) {
+        if (!fragment.includes('<')) return openTags;
+
+        const tags = openTags.slice();
+        for (const [open, slash, name] of fragment.matchAll(/<(\/?)([a-zA-Z][\w-]*)[^>]*>/g)) {
+            const tagName = name.toLowerCase();
+            if (!slash) {
+                tags.push({ name: tagName, open });
+                continue;
+            }
+            const index = tags.map(tag => tag.name).lastIndexOf(tagName);
+            if (index !== -1) tags.splice(index, 1);
         }
+        return tags;
+    }
+
+    /**
+     * 直接调用 Telegram Bot API（经由 keep-alive 连接发送 JSON POST）
+     * @param {string} method - API 方法名，如 sendMessage
+     * @param {Object} payload - 请求参数
+     * @returns {Promise<Object>} API 返回的 result 字段
+     * @private
+     */
+    _callTelegramApi(method, payload) {
+        const body = JSON.stringify(payload);
+
+        return new Promise((resolve, reject) => {
+            const req = https.request({
+                hostname: 'api.telegram.org',
+                path: `/bot${this.telegramToken}/${method}`,
+                method: 'POST',
+                agent: this.telegramAgent,
+                timeout: TELEGRAM_REQUEST_TIMEOUT,
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Content-Length': Buffer.byteLength(body)
+                }
+            }, (res) => {
+                const chunks = [];
+                res.on('data', chunk => chunks.push(chunk));
+                res.on('end', () => {
+                    let data;
+                    try {
+                        data = JSON.parse(Buffer.concat(chunks).toString('utf8'));
+                    } catch (parseError) {
+                        return reject(new Error(`Telegram 响应解析失败 (HTTP ${res.statusCode})`));
+                    }
+                    if (!data.ok) {
+                        return reject(new Error(`Telegram API 错误 ${data.error_code || res.statusCode}: ${data.description}`));
+                    }
+                    resolve(data.result);
+                });
+            });
+
+            req.on('timeout', () => req.destroy(new Error('Telegram 请求超时')));
+            req.on('error', reject);
+            req.end(body);
+        });
     }
 
     /**
      * 生成 AI 总结内容
      * @param {string} period - 时间段标识
+     * @param {Object} [options={}] - 生成选项
+     * @param {Array} [options.tweets] - 调用方已获取的推文数组
+     * @param {Array} [options.childSummaries] - 下级时间段总结数组（提供时不再读取原始推文）
+     * @param {Object} [options.timeRange] - 对应的时间范围对象
+     * @param {boolean} [options.useCache=true] - 是否使用AI响应缓存
      * @returns {Promise<string>} HTML 格式的总结内容
+     * @throws {Error} 数据库不可用或AI调用失败时抛出，由调用方记录为失败的总结
      */
-    async generateSummary(period) {
+    async generateSummary(period, options = {}) {
+        const { useCache = true } = options;
+
         try {
             logger.info(`开始为${period}生成总结...`);
 
             if (!this.db) {
-                return this._getDbErrorHtml();
+                throw new Error('数据库连接失败，请确保已运行爬虫收集数据');
             }
 
-            // 使用TimeUtil计算时间范围
-            const timeRange = TimeUtil.calculateTimeRange(period);
+            // 使用TimeUtil计算时间范围（调用方已提供时直接复用）
+            const timeRange = options.timeRange || TimeUtil.calculateTimeRange(period);
             const queryStart = timeRange.start;
             const queryEnd = timeRange.end;
 
             logger.info(`生成${period}总结，时间范围: 从 ${queryStart.toLocaleString()} 到 ${queryEnd.toLocaleString()}`);
-            const tweets = await this.db.getTweetsInTimeRange(queryStart, queryEnd);
-
-            if (!tweets || tweets.length === 0) {
+            const { childSummaries } = options;
+            const tweets = childSummaries ? null :
+                options.tweets || await this.db.getTweetsInTimeRange(queryStart, queryEnd, SUMMARY_TWEET_COLUMNS);
+            const sourceIds = childSummaries
+                ? childSummaries.map(summary => `summary:${summary.id}`)
+                : (tweets || []).map(tweet => tweet.id);
+
+            if (sourceIds.length === 0) {
                 return this._getNoDataHtml(period);
             }
 
-            logger.info(`准备为${period}内的${tweets.length}条推文生成AI总结`);
-            const tweetsText = this._formatTweetsForAI(tweets);
-            logger.debug(`生成的推文文本长度: ${tweetsText.length} 字符`);
+            // 相同时间窗口内输入集合（推文或下级总结）未变化时直接复用上次的AI结果
+            const cacheKey = this._getAICacheKey(period, timeRange, sourceIds);
+            if (useCache) {
+                const cached = this._getCachedAIResponse(cacheKey);
+                if (cached) {
+                    logger.info(`${period}推文集合未变化，命中AI响应缓存，跳过AI调用`);
+                    return cached;
+                }
+            }
 
-            // 使用北京时间范围
-            const timeRangeStr = `${timeRange.beijingStart} 到 ${timeRange.beijingEnd} (北京时间)`;
+            // 推文极少时AI总结没有压缩价值，直接按模板列出原文
+            if (!childSummaries && tweets.length < SUMMARY_CONFIG.MIN_TWEETS_FOR_AI) {
+                logger.info(`${period}内仅有${tweets.length}条推文，跳过AI调用，使用模板总结`);
+                return this._getSparseTweetsHtml(tweets);
+            }
 
-            const userPrompt = `请扮演“总结大师”，用HTML生成10条中文要点，方便嵌入网页/Tg：
-- 使用<ol><li>…</li></ol>有序列表；不要输出代码块或表格
-- 聚焦事件/结论，突出数字/影响/动作，避免客套
-- 优先写发射/空投/IDO等信号（规则、时间、参与方式），再写合作/技术/市场动向
-- 如有来源链接，在该条末尾追加 <a href="链接" target="_blank">[01]</a>，多来源累加 [02][03]…
+            let material;
+            if (childSummaries) {
+                logger.info(`准备基于${childSummaries.length}份下级总结为${period}生成AI总结`);
+                material = `以下是按时间顺序排列的分时段总结：\n${this._formatChildSummariesForAI(childSummaries)}`;
+            } else {
+                logger.info(`准备为${period}内的${tweets.length}条推文生成AI总结`);
+                material = `以下是推文片段：\n${this._formatTweetsForAI(this._condenseTweetsForAI(tweets))}`;
+            }
+            logger.debug(`生成的输入文本长度: ${material.length} 字符`);
 
-时间范围: ${timeRangeStr}
+            // 使用北京时间范围
+            const timeRangeStr = `${timeRange.beijingStart} 到 ${timeRange.beijingEnd} (北京时间)`;
 
-以下是推文片段：
-${tweetsText}`;
+            const userPrompt = `${USER_PROMPT_INSTRUCTIONS}\n\n时间范围: ${timeRangeStr}\n\n${material}`;
             logger.info('正在调用AI生成总结...');
 
             const content = await this._callAIWithRetry(userPrompt);
@@ -603,17 +913,128 @@ ${tweetsText}`;
 
             if (cleanedContent.length > 100000) {
                 logger.warn(`生成的内容过长 (${cleanedContent.length} 字符)，可能导致传输问题`);
-                return cleanedContent.substring(0, 100000) + '...[内容过长，已截断]';
+                cleanedContent = cleanedContent.substring(0, 100000) + '...[内容过长，已截断]';
             }
 
+            this._setCachedAIResponse(cacheKey, cleanedContent);
             return cleanedContent;
         } catch (error) {
-            const errorMsg = `生成${period}总结时出错: ${error}`;
-            logger.error(errorMsg);
-            return this._getErrorHtml(error.message);
+            // 失败不能以正文形式返回，否则会被保存为成功的总结并进入上级总结的输入
+            logger.error(`生成${period}总结时出错: ${error}`);
+            throw error;
         }
     }
 
+    // ==================== AI 响应缓存 ====================
+
+    /**
+     * 计算AI响应缓存键（模型、系统与用户提示词、压缩参数、时间窗口和输入ID集合）
+     * @param {string} period - 时间段
+     * @param {Object} timeRange - 时间范围对象
+     * @param {Array<string>} sourceIds - 推文ID或下级总结ID
+     * @returns {string} SHA-256 十六进制摘要
+     * @private
+     */
+    _getAICacheKey(period, timeRange, sourceIds) {
+        return crypto.createHash('sha256')
+            .update(this.xaiModel)
+            .update(SYSTEM_PROMPT)
+            .update(USER_PROMPT_INSTRUCTIONS)
+            // 提示词压缩参数同样决定最终提示词内容
+            .update(`${SUMMARY_CONFIG.MAX_PROMPT_TWEETS}|${SUMMARY_CONFIG.PROMPT_TAIL_TWEETS}|` +
+                `${SUMMARY_CONFIG.MAX_TWEET_TEXT_LENGTH}|${SUMMARY_CONFIG.MIN_TWEETS_FOR_AI}|`)
+            .update(`${period}|${timeRange.startFormatted}|${timeRange.endFormatted}|`)
+            .update([...sourceIds].sort().join(','))
+            .digest('hex');
+    }
+
+    /**
+     * 读取未过期的AI响应缓存
+     * @param {string} key - 缓存键
+     * @returns {string|null} 缓存的总结内容
+     * @private
+     */
+    _getCachedAIResponse(key) {
+        const entry = this.aiResponseCache.get(key);
+        if (!entry) return null;
+
+        if (Date.now() - entry.createdAt > SUMMARY_CONFIG.AI_CACHE_TTL) {
+            this.aiResponseCache.delete(key);
+            return null;
+        }
+        return entry.content;
+    }
+
+    /**
+     * 写入AI响应缓存（超出上限时淘汰最早的条目）
+     * @param {string} key - 缓存键
+     * @param {string} content - 总结内容
+     * @private
+     */
+    _setCachedAIResponse(key, content) {
+        this.aiResponseCache.delete(key);
+        this.aiResponseCache.set(key, { content, createdAt: Date.now() });
+
+        while (this.aiResponseCache.size > SUMMARY_CONFIG.AI_CACHE_MAX_ENTRIES) {
+            const oldestKey = this.aiResponseCache.keys().next().value;
+            this.aiResponseCache.delete(oldestKey);
+        }
+    }
+
+    /**
+     * 压缩输入AI的推文集合以控制提示词长度
+     *
+     * - 去除正文完全相同的重复推文
+     * - 超过上限时保留最新的若干条，其余按互动量挑选
+     * - 截断过长的推文正文
+     *
+     * @param {Array} tweets - 推文数组
+     * @returns {Array} 压缩后的推文数组（保持原有顺序）
+     * @private
+     */
+    _condenseTweetsForAI(tweets) {
+        const {
+            MAX_PROMPT_TWEETS,
+            PROMPT_TAIL_TWEETS,
+            MAX_TWEET_TEXT_LENGTH
+        } = SUMMARY_CONFIG;
+
+        const seenTexts = new Set();
+        let selected = tweets.filter(tweet => {
+            const key = (tweet.text || '').trim();
+            if (seenTexts.has(key)) return false;
+            seenTexts.add(key);
+            return true;
+        });
+
+        if (selected.length > MAX_PROMPT_TWEETS) {
+            const byTime = selected
+                // 数据库行自带数值时间戳，无需再解析 Twitter 日期字符串
+                .map(tweet => ({ tweet, ms: tweet.created_at_ms ?? (Date.parse(tweet.created_at) || 0) }))
+                .sort((a, b) => b.ms - a.ms)
+                .map(item => item.tweet);
+
+            const keep = new Set(byTime.slice(0, PROMPT_TAIL_TWEETS));
+            const engagement = tweet =>
+                (tweet.like_count || 0) + (tweet.retweet_count || 0) + (tweet.reply_count || 0);
+            byTime.slice(PROMPT_TAIL_TWEETS)
+                .sort((a, b) => engagement(b) - engagement(a))
+                .slice(0, MAX_PROMPT_TWEETS - PROMPT_TAIL_TWEETS)
+                .forEach(tweet => keep.add(tweet));
+
+            selected = selected.filter(tweet => keep.has(tweet));
+        }
+
+        if (selected.length < tweets.length) {
+            logger.info(`提示词压缩: ${tweets.length} 条推文精简为 ${selected.length} 条`);
+        }
+
+        return selected.map(tweet => {
+            if (!tweet.text || tweet.text.length <= MAX_TWEET_TEXT_LENGTH) return tweet;
+            return { ...tweet, text: tweet.text.substring(0, MAX_TWEET_TEXT_LENGTH) + '…' };
+        });
+    }
+
     /**
      * 格式化推文数据用于AI输入
      * @param {Array} tweets - 推文数组
@@ -621,18 +1042,61 @@ ${tweetsText}`;
      * @private
      */
     _formatTweetsForAI(tweets) {
-        const formattedTweets = tweets.map(tweet => {
-            const tweetUrl = `https://x.com/${tweet.screen_name}/status/${tweet.id}`;
-            return `用户: ${tweet.username} (@${tweet.screen_name})\n` +
-                `发布时间: ${tweet.created_at}\n` +
-                `内容: ${tweet.text}\n` +
-                `交互数据: ${tweet.like_count}点赞, ${tweet.retweet_count}转发, ${tweet.reply_count}回复` +
-                (tweet.media_urls ? `\n媒体: ${tweet.media_urls}` : '') +
-                `\n源: ${tweetUrl}` +
-                '\n' + '='.repeat(30);
-        }).join('\n');
-
-        return formattedTweets;
+        // 所有片段追加到同一个数组，最后只做一次拼接
+        const parts = [];
+        for (let i = 0; i < tweets.length; i++) {
+            const tweet = tweets[i];
+            if (i > 0) parts.push('\n');
+            parts.push(
+                '用户: ', tweet.username, ' (@', tweet.screen_name, ')\n',
+                '发布时间: ', tweet.created_at, '\n',
+                '内容: ', tweet.text, '\n',
+                '交互数据: ', tweet.like_count || 0, '点赞, ', tweet.retweet_count || 0, '转发, ',
+                tweet.reply_count || 0, '回复\n'
+            );
+            if (tweet.media_urls) parts.push('媒体: ', tweet.media_urls, '\n');
+            parts.push('源: https://x.com/', tweet.screen_name, '/status/', tweet.id, '\n', TWEET_SEPARATOR);
+        }
+        return parts.join('');
+    }
+
+    /**
+     * 格式化下级时间段总结用于AI输入
+     * @param {Array} summaries - 总结记录数组（按时间升序）
+     * @returns {string} 格式化后的文本
+     * @private
+     */
+    _formatChildSummariesForAI(summaries) {
+        return summaries.map(summary =>
+            `时段: ${TimeUtil.formatToBeiJingTime(new Date(summary.start_time))} 到 ` +
+            `${TimeUtil.formatToBeiJingTime(new Date(summary.end_time))} (北京时间)\n` +
+            `推文数: ${summary.tweet_count}\n` +
+            `${summary.content}\n` +
+            TWEET_SEPARATOR
+        ).join('\n');
+    }
+
+    /**
+     * 以流式方式发送补全请求并拼接返回的文本片段
+     * @param {Object} request - 补全请求参数
+     * @returns {Promise<string>} 完整的生成文本
+     * @private
+     */
+    async _readCompletionStream(request) {
+        const startedAt = Date.now();
+        const stream = await this.xaiClient.chat.completions.create({ ...request, stream: true });
+
+        const parts = [];
+        for await (const chunk of stream) {
+            const delta = chunk.choices?.[0]?.delta?.content;
+            if (!delta) continue;
+            if (parts.length === 0) {
+                logger.debug(`AI首个响应片段耗时 ${Date.now() - startedAt}ms`);
+            }
+            parts.push(delta);
+        }
+
+        return parts.join('');
     }
 
     /**
@@ -642,7 +1106,6 @@ ${tweetsText}`;
      * @private
      */
     async _callAIWithRetry(userPrompt) {
-        const timeoutMs = 300000; // 5分钟超时
         const maxRetries = 2;
         let lastError = null;
 
@@ -653,18 +1116,23 @@ ${tweetsText}`;
                     await new Promise(resolve => setTimeout(resolve, 3000 * attempt));
                 }
 
-                logger.info(`使用 xAI Grok 模型发送HTTP请求...`);
+                // 首次尝试使用流式响应，边生成边接收，连接不会长时间空闲；
+                // 重试时回退为普通请求
+                const useStream = AI_CONFIG.stream && attempt === 0;
+                logger.info(`使用 xAI Grok 模型发送HTTP请求${useStream ? '（流式）' : ''}...`);
 
-                const response = await this.xaiClient.chat.completions.create({
+                const request = {
                     model: this.xaiModel,
                     messages: [
-                        { role: 'system', content: SYSTEM_PROMPT },
+                        SYSTEM_MESSAGE,
                         { role: 'user', content: userPrompt }
                     ],
                     temperature: AI_CONFIG.temperature
-                });
+                };
 
-                const text = response?.choices?.[0]?.message?.content;
+                const text = useStream
+                    ? await this._readCompletionStream(request)
+                    : (await this.xaiClient.chat.completions.create(request))?.choices?.[0]?.message?.content;
                 if (!text) {
                     throw new Error('xAI API返回空响应');
                 }
@@ -687,23 +1155,6 @@ ${tweetsText}`;
         throw lastError || new Error("所有重试尝试均失败");
     }
 
-    /**
-     * 获取数据库错误的HTML消息
-     * @returns {string} 错误消息HTML
-     * @private
-     */
-    _getDbErrorHtml() {
-        return `<div class="error-message">
-            <h3>😕 无法获取数据</h3>
-            <p>数据库连接失败。请检查以下问题：</p>
-            <ul>
-                <li>确保数据库文件存在</li>
-                <li>检查日志文件获取更多信息</li>
-                <li>确保已运行爬虫收集数据</li>
-            </ul>
-        </div>`;
-    }
-
     /**
      * 获取无数据的HTML消息
      * @param {string} period - 时间段
@@ -717,6 +1168,22 @@ ${tweetsText}`;
         </div>`;
     }
 
+    /**
+     * 推文过少时的模板总结：每条推文一个要点，附按顺序编号的原文链接
+     * @param {Array} tweets - 推文数组
+     * @returns {string} 与AI总结相同结构的有序列表HTML
+     * @private
+     */
+    _getSparseTweetsHtml(tweets) {
+        const items = tweets.map((tweet, i) => {
+            const url = `https://x.com/${encodeURIComponent(tweet.screen_name || '')}/status/${encodeURIComponent(tweet.id)}`;
+            const label = String(i + 1).padStart(2, '0');
+            return ` <li>@${escapeHtml(tweet.screen_name)}: ${escapeHtml(tweet.text)} ` +
+                `<a href="${escapeHtml(url)}" target="_blank">[${label}]</a></li>`;
+        });
+        return `<ol>\n${items.join('\n')}\n</ol>`;
+    }
+
     /**
      * 获取错误的HTML消息
      * @param {string} message - 错误消息
@@ -737,6 +1204,9 @@ ${tweetsText}`;
         if (this.db) {
             this.db.close();
         }
+        if (this.telegramAgent) {
+            this.telegramAgent.destroy();
+        }
     }
 
     /**
@@ -781,7 +1251,7 @@ ${tweetsText}`;
  */
 function setupWebServer(summarizer) {
     const app = express();
-    app.use(express.json());
+    // 所有接口都不读取请求体，因此不挂载全局 JSON 解析中间件
     app.use(express.static('public'));
 
     _configureServer(app);
@@ -830,9 +1300,7 @@ function _setupRoutes(app, summarizer) {
     app.get('/api/summary/:period', async (req, res) => {
         const { period } = req.params;
         const summaryId = req.query.id; // 新增：支持通过ID查询特定报告
-        const validPeriods = ['1hour', '12hours', '1day'];
-
-        if (!validPeriods.includes(period)) {
+        if (!VALID_PERIODS.includes(period)) {
             return res.status(400).json({ error: '无效的时间段' });
         }
 
@@ -841,7 +1309,7 @@ function _setupRoutes(app, summarizer) {
         }
 
         try {
-            logger.info(`接收到Web请求：获取${period}总结${summaryId ? ` (ID: ${summaryId})` : ''}`);
+            logger.debug(`接收到Web请求：获取${period}总结${summaryId ? ` (ID: ${summaryId})` : ''}`);
 
             let summary;
             if (summaryId) {
@@ -887,9 +1355,7 @@ function _setupRoutes(app, summarizer) {
         const limit = parseInt(req.query.limit || '10', 10);
         const page = parseInt(req.query.page || '1', 10);
         const offset = (page - 1) * limit;
-        const validPeriods = ['1hour', '12hours', '1day'];
-
-        if (!validPeriods.includes(period)) {
+        if (!VALID_PERIODS.includes(period)) {
             return res.status(400).json({ error: '无效的时间段' });
         }
 
@@ -898,7 +1364,7 @@ function _setupRoutes(app, summarizer) {
         }
 
         try {
-            logger.info(`接收到Web请求：获取${period}总结历史 (页码: ${page}, 每页显示: ${limit}条)`);
+            logger.debug(`接收到Web请求：获取${period}总结历史 (页码: ${page}, 每页显示: ${limit}条)`);
             const history = await summarizer.db.getSummaryHistory(period, limit, offset);
 
             return res.json({
@@ -926,9 +1392,7 @@ function _setupRoutes(app, summarizer) {
     app.post('/api/summary/:period/generate', async (req, res) => {
         const { period } = req.params;
         const summaryId = req.query.id; // 检查是否指定了历史报告ID
-        const validPeriods = ['1hour', '12hours', '1day'];
-
-        if (!validPeriods.includes(period)) {
+        if (!VALID_PERIODS.includes(period)) {
             return res.status(400).json({ error: '无效的时间段' });
         }
 
@@ -992,15 +1456,7 @@ function _formatSummaryResponse(summary) {
     const timeRange = `${startHour}:00～${endHour}:00`;
 
     // 格式化完整的北京时间显示
-    const formattedTime = beijingStartTime.toLocaleString('zh-CN', {
-        year: 'numeric',
-        month: '2-digit',
-        day: '2-digit',
-        hour: '2-digit',
-        minute: '2-digit',
-        second: '2-digit',
-        hour12: false
-    });
+    const formattedTime = TimeUtil.formatToBeiJingTime(startTime);
 
     return {
         success: true,
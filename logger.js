@@ -79,19 +79,20 @@ const consoleFormat = winston.format.combine(
  * @param {string} component - 组件名称（如 'spider', 'database', 'summary'）
  * @param {Object} [options={}] - 配置选项
  * @param {string} [options.level] - 日志级别（默认：info）
- * @param {boolean} [options.enableConsole=true] - 是否启用控制台输出
+ * @param {boolean} [options.enableConsole] - 是否启用控制台输出（默认启用，LOG_CONSOLE=false 时关闭）
  * @param {boolean} [options.enableFile=true] - 是否启用文件输出
- * @param {number} [options.maxSize=5242880] - 单个日志文件最大大小（字节，默认5MB）
- * @param {number} [options.maxFiles=5] - 保留的日志文件数量
+ * @param {number} [options.maxSize] - 单个日志文件最大大小（字节，默认 LOG_MAX_SIZE 或5MB）
+ * @param {number} [options.maxFiles] - 保留的日志文件数量（默认 LOG_MAX_FILES 或5）
  * @returns {winston.Logger} Winston 日志记录器实例
  */
 function createLogger(component, options = {}) {
     const {
         level = process.env.LOG_LEVEL || 'info',
-        enableConsole = true,
+        // stdout 已被重定向到文件时（如 start.sh）可设 LOG_CONSOLE=false，避免与文件传输器重复写入
+        enableConsole = process.env.LOG_CONSOLE !== 'false',
         enableFile = true,
-        maxSize = 5242880,  // 5MB
-        maxFiles = 5
+        maxSize = parseInt(process.env.LOG_MAX_SIZE, 10) || 5242880,  // 5MB
+        maxFiles = parseInt(process.env.LOG_MAX_FILES, 10) || 5
     } = options;
 
     const transports = [];
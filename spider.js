@@ -13,6 +13,8 @@
 require('dotenv').config();
 const fs = require('fs');
 const path = require('path');
+const { Readable } = require('stream');
+const { pipeline } = require('stream/promises');
 const axios = require('axios');
 const schedule = require('node-schedule');
 const { createLogger } = require('./logger');
@@ -302,7 +304,9 @@ class TwitterPoller {
 
             if (!userData) {
                 logger.error(`找不到用户 ${username}，API返回数据格式不符合预期`);
-                logger.debug(`API响应结构: ${JSON.stringify(responseData).substring(0, 1000)}`);
+                if (logger.isLevelEnabled('debug')) {
+                    logger.debug(`API响应结构: ${JSON.stringify(responseData).substring(0, 1000)}`);
+                }
                 return null;
             }
 
@@ -310,7 +314,9 @@ class TwitterPoller {
             const userInfo = this._extractUserObject(userData);
             if (!userInfo) {
                 logger.error(`无法从API响应中提取用户 ${username} 的信息`);
-                logger.debug(`用户数据: ${JSON.stringify(userData).substring(0, 500)}`);
+                if (logger.isLevelEnabled('debug')) {
+                    logger.debug(`用户数据: ${JSON.stringify(userData).substring(0, 500)}`);
+                }
                 return null;
             }
 
@@ -384,7 +390,10 @@ class TwitterPoller {
             if (usersArray.length === 0) {
                 logger.warn(`无法从API响应中提取用户数组，可能这批用户ID无效或已被删除`);
                 logger.debug(`请求的用户ID: ${validUserIds.slice(0, 10).join(', ')}${validUserIds.length > 10 ? '...' : ''}`);
-                logger.debug(`API响应结构: ${JSON.stringify(responseData).substring(0, 500)}`);
+                // 序列化整个响应开销较大，仅在调试级别开启时执行
+                if (logger.isLevelEnabled('debug')) {
+                    logger.debug(`API响应结构: ${JSON.stringify(responseData).substring(0, 500)}`);
+                }
                 return [];
             }
 
@@ -459,47 +468,12 @@ class TwitterPoller {
                 }
             });
 
-            // 验证响应数据结构
-            if (!tweetsResponse.data?.result?.timeline?.instructions) {
-                logger.error(`无法获取用户 ${username} 的推文，API返回数据格式不符合预期`);
-                return [];
-            }
-
-            // 寻找TimelineAddEntries指令
-            const addEntriesInstruction = tweetsResponse.data.result.timeline.instructions.find(
-                instruction => instruction.type === 'TimelineAddEntries'
+            const processedTweets = this._extractTweetsFromTimeline(
+                tweetsResponse.data,
+                `用户 ${username}`,
+                { user_id: userId, username, screen_name }
             );
 
-            if (!addEntriesInstruction?.entries) {
-                logger.error(`用户 ${username} 的推文数据结构不符合预期，找不到TimelineAddEntries指令或entries`);
-                return [];
-            }
-
-            const processedTweets = [];
-            let validEntries = 0;
-            let nonTweetEntries = 0;
-
-            // 处理每个推文
-            for (const entry of addEntriesInstruction.entries) {
-                const tweet = this.extractTweetFromEntry(entry);
-                if (tweet) {
-                    validEntries++;
-                    processedTweets.push({
-                        ...tweet,
-                        user_id: userId,
-                        username: username,
-                        screen_name: screen_name
-                    });
-                } else {
-                    // 统计非推文条目
-                    nonTweetEntries++;
-                }
-            }
-
-            // 详细日志记录处理结果
-            const totalEntries = addEntriesInstruction.entries.length;
-            logger.info(`成功获取到 ${processedTweets.length} 条 ${username} 的推文 (API返回条目总数: ${totalEntries}, 有效推文: ${validEntries}, 非推文条目: ${nonTweetEntries})`);
-
             // 如果没有获取到足够的推文，显示警告
             if (processedTweets.length < SPIDER_CONFIG.MAX_TWEETS_PER_REQUEST && processedTweets.length > 0) {
                 logger.warn(`获取的推文数量 (${processedTweets.length}) 少于请求的数量 (${SPIDER_CONFIG.MAX_TWEETS_PER_REQUEST})，可能是用户推文较少或API限制`);
@@ -530,60 +504,8 @@ class TwitterPoller {
                 }
             });
 
-            // 验证响应数据结构
-            if (!timelineResponse.data?.result?.timeline?.instructions) {
-                logger.error(`无法获取列表 ${listId} 的推文，API返回数据格式不符合预期`);
-                return [];
-            }
-
-            // 寻找TimelineAddEntries指令
-            const addEntriesInstruction = timelineResponse.data.result.timeline.instructions.find(
-                instruction => instruction.type === 'TimelineAddEntries'
-            );
-
-            if (!addEntriesInstruction?.entries) {
-                logger.error(`列表 ${listId} 的推文数据结构不符合预期，找不到TimelineAddEntries指令或entries`);
-                return [];
-            }
-
-            const processedTweets = [];
-            let validEntries = 0;
-            let nonTweetEntries = 0;
-
-            // 处理每个推文
-            for (const entry of addEntriesInstruction.entries) {
-                const tweet = this.extractTweetFromEntry(entry);
-                if (tweet) {
-                    validEntries++;
-
-                    // 尝试提取用户信息
-                    const tweetResults = entry.content?.itemContent?.tweet_results;
-                    const tweetData = tweetResults?.result;
-                    const userInfo = tweetData?.core?.user_results?.result;
-
-                    if (userInfo?.legacy) {
-                        tweet.user_id = userInfo.rest_id;
-                        tweet.username = userInfo.legacy.screen_name;  // @ 用户名
-                        tweet.screen_name = userInfo.legacy.screen_name;  // @ 用户名（和 username 一样）
-                    } else {
-                        // 如果无法提取用户信息，使用占位符
-                        tweet.user_id = 'unknown';
-                        tweet.username = 'unknown';
-                        tweet.screen_name = 'unknown';
-                    }
-
-                    processedTweets.push(tweet);
-                } else {
-                    // 统计非推文条目
-                    nonTweetEntries++;
-                }
-            }
-
-            // 详细日志记录处理结果
-            const totalEntries = addEntriesInstruction.entries.length;
-            logger.info(`成功获取列表 ${listId} 的 ${processedTweets.length} 条推文 (API返回条目总数: ${totalEntries}, 有效推文: ${validEntries}, 非推文条目: ${nonTweetEntries})`);
-
-            return processedTweets;
+            // 列表推文的作者信息从推文自身的 core 字段中提取
+            return this._extractTweetsFromTimeline(timelineResponse.data, `列表 ${listId}`);
         } catch (error) {
             this.logApiError(error, `获取列表 ${listId} 推文时间线时出错`);
             return [];
@@ -717,13 +639,65 @@ class TwitterPoller {
 
     // ==================== 数据提取辅助方法 ====================
 
+    /**
+     * 从时间线接口响应中提取全部推文（用户时间线与列表时间线共用）
+     * @param {Object} responseData - API 响应数据
+     * @param {string} sourceLabel - 日志中使用的来源描述（如 "用户 xxx"、"列表 123"）
+     * @param {Object} [author=null] - 已知的作者信息，传给 extractTweetFromEntry
+     * @returns {Array} 推文对象数组，结构不符合预期时返回空数组
+     * @private
+     */
+    _extractTweetsFromTimeline(responseData, sourceLabel, author = null) {
+        // 验证响应数据结构
+        const instructions = responseData?.result?.timeline?.instructions;
+        if (!instructions) {
+            logger.error(`无法获取${sourceLabel} 的推文，API返回数据格式不符合预期`);
+            return [];
+        }
+
+        // 寻找TimelineAddEntries指令
+        const addEntriesInstruction = instructions.find(
+            instruction => instruction.type === 'TimelineAddEntries'
+        );
+
+        if (!addEntriesInstruction?.entries) {
+            logger.error(`${sourceLabel} 的推文数据结构不符合预期，找不到TimelineAddEntries指令或entries`);
+            return [];
+        }
+
+        const processedTweets = [];
+        let nonTweetEntries = 0;
+
+        // 处理每个推文
+        for (const entry of addEntriesInstruction.entries) {
+            const tweet = this.extractTweetFromEntry(entry, author);
+            if (tweet) {
+                processedTweets.push(tweet);
+            } else {
+                // 统计非推文条目
+                nonTweetEntries++;
+            }
+        }
+
+        // 详细日志记录处理结果
+        const totalEntries = addEntriesInstruction.entries.length;
+        logger.info(`成功获取${sourceLabel} 的 ${processedTweets.length} 条推文 (API返回条目总数: ${totalEntries}, 有效推文: ${processedTweets.length}, 非推文条目: ${nonTweetEntries})`);
+
+        return processedTweets;
+    }
+
     /**
      * 从 Timeline Entry 中提取推文数据
+     *
+     * 作者字段与推文字段在同一个对象字面量中一次性构建，避免事后展开复制或追加属性
+     *
      * @param {Object} entry - Timeline 条目对象
+     * @param {Object} [author=null] - 已知的作者信息 {user_id, username, screen_name}，
+     *                                 未提供时从推文的 core 字段中提取
      * @returns {Object|null} 规范化的推文数据，无效条目返回 null
      * @private
      */
-    extractTweetFromEntry(entry) {
+    extractTweetFromEntry(entry, author = null) {
         // 验证条目结构
         if (!entry.content?.entryType || entry.content.entryType !== 'TimelineTimelineItem') {
             return null;
@@ -741,29 +715,44 @@ class TwitterPoller {
         const tweet = tweetResults.result;
 
         // 确保legacy属性存在
-        if (!tweet.legacy) {
+        const legacy = tweet.legacy;
+        if (!legacy) {
             logger.warn(`推文 ${tweet.rest_id || tweet.id || 'unknown'} 缺少legacy属性，已跳过`);
             return null;
         }
 
-        // 提取媒体URL (如果有)
-        let mediaUrls = [];
-        if (tweet.legacy.extended_entities?.media) {
-            mediaUrls = tweet.legacy.extended_entities.media.map(media => media.media_url_https);
+        // 未指定作者时从推文数据中提取，无法提取则使用占位符
+        let userId = 'unknown';
+        let screenName = 'unknown';
+        if (author) {
+            userId = author.user_id;
+            screenName = author.screen_name;
+        } else {
+            const userInfo = tweet.core?.user_results?.result;
+            if (userInfo?.legacy) {
+                userId = userInfo.rest_id;
+                screenName = userInfo.legacy.screen_name;  // @ 用户名
+            }
         }
 
+        // 提取媒体URL (如果有)
+        const media = legacy.extended_entities?.media;
+
         // 返回规范化的推文数据
         return {
             id: tweet.rest_id,
-            text: tweet.legacy.full_text,
-            created_at: tweet.legacy.created_at,
-            retweet_count: tweet.legacy.retweet_count,
-            like_count: tweet.legacy.favorite_count,
-            reply_count: tweet.legacy.reply_count,
-            quote_count: tweet.legacy.quote_count,
-            bookmark_count: tweet.legacy.bookmark_count,
+            user_id: userId,
+            username: author ? author.username : screenName,
+            screen_name: screenName,                        // @ 用户名（和 username 一样）
+            text: legacy.full_text,
+            created_at: legacy.created_at,
+            retweet_count: legacy.retweet_count,
+            like_count: legacy.favorite_count,
+            reply_count: legacy.reply_count,
+            quote_count: legacy.quote_count,
+            bookmark_count: legacy.bookmark_count,
             view_count: tweet.views ? tweet.views.count : 0,
-            media_urls: mediaUrls.join(',')
+            media_urls: media ? media.map(item => item.media_url_https).join(',') : ''
         };
     }
 
@@ -843,8 +832,8 @@ class TwitterPoller {
                 }
 
                 for (const batch of batches) {
-                    const promises = batch.map(following => this.dbManager.saveUser(following));
-                    const results = await Promise.all(promises);
+                    // 整批用户在一个事务中写入，避免每个用户单独提交
+                    const results = await this.dbManager.saveUsers(batch);
 
                     // 更新统计信息
                     for (const result of results) {
@@ -1140,6 +1129,18 @@ class TwitterPoller {
      * @returns {Promise<Object>} 单个列表的处理结果
      */
     async pollList(listId, count = SPIDER_CONFIG.MAX_TWEETS_PER_REQUEST) {
+        const tweets = await this.getListTimeline(listId, count);
+        return this._saveListTweets(listId, tweets);
+    }
+
+    /**
+     * 保存单个列表获取到的推文
+     * @param {string} listId - Twitter列表ID
+     * @param {Array} tweets - 推文对象数组
+     * @returns {Promise<Object>} 单个列表的处理结果
+     * @private
+     */
+    async _saveListTweets(listId, tweets) {
         const result = {
             listId,
             success: false,
@@ -1150,8 +1151,6 @@ class TwitterPoller {
         };
 
         try {
-            const tweets = await this.getListTimeline(listId, count);
-
             if (tweets.length === 0) {
                 logger.warn(`列表 ${listId} 未获取到推文`);
                 result.success = true;
@@ -1168,7 +1167,7 @@ class TwitterPoller {
 
             return result;
         } catch (error) {
-            logger.error(`获取列表 ${listId} 的推文时出错: ${error.message}`);
+            logger.error(`保存列表 ${listId} 的推文时出错: ${error.message}`);
             result.error = error.message;
             return result;
         }
@@ -1198,9 +1197,15 @@ class TwitterPoller {
 
         logger.info(`开始拉取 ${targets.length} 个Twitter列表的推文...`);
 
+        // 列表依次抓取以避免API限流；写入在后台进行，与后续列表的抓取重叠，
+        // 并由数据库的组提交合并到同一事务中
+        const pendingResults = [];
         for (const listId of targets) {
-            const result = await this.pollList(listId, SPIDER_CONFIG.MAX_TWEETS_PER_REQUEST);
+            const tweets = await this.getListTimeline(listId, SPIDER_CONFIG.MAX_TWEETS_PER_REQUEST);
+            pendingResults.push(this._saveListTweets(listId, tweets));
+        }
 
+        for (const result of await Promise.all(pendingResults)) {
             if (!result.success) {
                 runStats.errors++;
             } else {
@@ -1291,31 +1296,6 @@ class TwitterPoller {
         return stats;
     }
 
-    /**
-     * 记录API错误详情
-     * @param {Error} error - 错误对象
-     * @param {string} message - 错误消息前缀
-     * @private
-     */
-    logApiError(error, message) {
-        logger.error(`${message}: ${error.message}`);
-
-        if (error.response) {
-            // 服务器返回了错误响应
-            logger.error(`API错误响应: ${JSON.stringify({
-                status: error.response.status,
-                statusText: error.response.statusText,
-                data: error.response.data
-            })}`);
-        } else if (error.request) {
-            // 请求已发送但没有收到响应
-            logger.error(`API请求错误: 未收到响应`);
-        } else {
-            // 请求设置时发生错误
-            logger.error(`API配置错误: ${error.message}`);
-        }
-    }
-
     /**
      * 辅助方法：延迟执行
      * @param {number} ms - 毫秒数
@@ -1327,11 +1307,12 @@ class TwitterPoller {
     }
 
     /**
-     * 关闭数据库连接
+     * 关闭数据库连接（等待队列中的推文写入完成）
+     * @returns {Promise<void>}
      */
-    close() {
+    async close() {
         if (this.dbManager) {
-            this.dbManager.close();
+            await this.dbManager.close();
             logger.info('数据库连接已关闭');
         }
     }
@@ -1398,32 +1379,20 @@ class TwitterPoller {
                 'last_updated'
             ];
 
-            // 构建CSV行
-            const csvLines = [headers.join(',')];
-
-            // 添加每个用户的数据
-            for (const user of users) {
-                const row = [
-                    user.id || '',
-                    this._escapeCSVField(user.username || ''),
-                    user.screen_name || '',
-                    this._escapeCSVField(user.name || ''),
-                    this._escapeCSVField(user.description || ''),
-                    user.followers_count || 0,
-                    user.following_count || 0,
-                    user.tweet_count || 0,
-                    user.profile_image_url || '',
-                    user.is_following || 0,
-                    user.is_tracked || 0,
-                    user.last_updated || ''
-                ];
-                csvLines.push(row.join(','));
+            // 逐行流式写入临时文件，不在内存中拼接整个CSV，也不阻塞事件循环；
+            // 写完后原子重命名，并发导出或读取时不会看到写了一半的文件
+            const tempPath = `${filePath}.${process.pid}.${Date.now()}.tmp`;
+            try {
+                await pipeline(
+                    Readable.from(this._generateUserCsvLines(headers, users)),
+                    fs.createWriteStream(tempPath, { encoding: 'utf-8' })
+                );
+                await fs.promises.rename(tempPath, filePath);
+            } catch (writeError) {
+                await fs.promises.rm(tempPath, { force: true });
+                throw writeError;
             }
 
-            // 写入文件
-            const csvContent = csvLines.join('\n');
-            fs.writeFileSync(filePath, csvContent, 'utf-8');
-
             logger.info(`成功导出 ${users.length} 个用户到文件: ${filePath}`);
 
             return {
@@ -1442,6 +1411,34 @@ class TwitterPoller {
         }
     }
 
+    /**
+     * 逐行生成用户CSV内容（首行为表头，行间以换行分隔）
+     * @param {string[]} headers - CSV表头
+     * @param {Array} users - 用户对象数组
+     * @yields {string} CSV文本片段
+     * @private
+     */
+    *_generateUserCsvLines(headers, users) {
+        yield headers.join(',');
+
+        for (const user of users) {
+            yield '\n' + [
+                user.id || '',
+                this._escapeCSVField(user.username || ''),
+                user.screen_name || '',
+                this._escapeCSVField(user.name || ''),
+                this._escapeCSVField(user.description || ''),
+                user.followers_count || 0,
+                user.following_count || 0,
+                user.tweet_count || 0,
+                user.profile_image_url || '',
+                user.is_following || 0,
+                user.is_tracked || 0,
+                user.last_updated || ''
+            ].join(',');
+        }
+    }
+
     /**
      * 转义CSV字段（处理包含逗号、引号和换行符的字段）
      * @param {string} field - 要转义的字段
@@ -1677,8 +1674,7 @@ function main() {
             // 注册进程退出处理
             process.on('SIGINT', () => {
                 logger.info('接收到中断信号，正在关闭...');
-                poller.close();
-                process.exit(0);
+                poller.close().finally(() => process.exit(0));
             });
         }
     } catch (error) {
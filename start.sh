@@ -7,11 +7,14 @@ echo "$(date): 开始启动服务"
 mkdir -p logs
 echo "已创建日志目录: logs/"
 
+# 日志已由各组件写入 logs/ 下的轮换文件，关闭控制台输出以免重复写入；
+# 标准输出/错误仅用于捕获崩溃信息（logs/*.out）
+
 # 启动数据采集器 (spider.js)
 echo "正在启动数据采集器 (spider.js)..."
-nohup node spider.js > logs/spider.log 2>&1 &
+LOG_CONSOLE=false nohup node spider.js > logs/spider.out 2>&1 &
 SPIDER_PID=$!
-echo "数据采集器已启动，PID: $SPIDER_PID，日志文件: logs/spider.log"
+echo "数据采集器已启动，PID: $SPIDER_PID，日志文件: logs/spider.log (标准输出: logs/spider.out)"
 
 # 等待2秒确保数据采集器正常启动
 sleep 2
@@ -25,9 +28,9 @@ fi
 
 # 启动Web服务和总结生成器 (index.js)
 echo "正在启动Web服务和总结生成器 (index.js)..."
-nohup node index.js > logs/index.log 2>&1 &
+LOG_CONSOLE=false nohup node index.js > logs/index.out 2>&1 &
 INDEX_PID=$!
-echo "Web服务已启动，PID: $INDEX_PID，日志文件: logs/index.log"
+echo "Web服务已启动，PID: $INDEX_PID，日志文件: logs/summary.log (标准输出: logs/index.out)"
 
 # 等待2秒确保Web服务正常启动
 sleep 2
@@ -51,7 +54,7 @@ echo "Web界面: http://localhost:${PORT:-5000}"
 echo ""
 echo "使用以下命令检查服务状态:"
 echo "  - 查看数据采集器日志: tail -f logs/spider.log"
-echo "  - 查看Web服务日志: tail -f logs/index.log"
+echo "  - 查看Web服务日志: tail -f logs/summary.log"
 echo ""
 echo "使用以下命令停止服务:"
 echo "  - kill \$(cat logs/spider.pid) \$(cat logs/index.pid)"
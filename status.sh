@@ -58,10 +58,10 @@ else
 fi
 
 # 显示最近的Web服务日志
-if [ -f "logs/index.log" ]; then
+if [ -f "logs/summary.log" ]; then
     echo "  最近日志:"
     echo "  ------------------------------------------------"
-    tail -n 5 logs/index.log | sed 's/^/  /'
+    tail -n 5 logs/summary.log | sed 's/^/  /'
     echo "  ------------------------------------------------"
 else
     echo "  日志文件不存在"
@@ -86,5 +86,5 @@ echo "===== 系统状态检查完成 ====="
 echo ""
 echo "查看完整日志:"
 echo "  数据采集器: tail -f logs/spider.log"
-echo "  Web服务: tail -f logs/index.log"
+echo "  Web服务: tail -f logs/summary.log"
 echo "" 
\ No newline at end of file
@@ -0,0 +1,27 @@
+/**
+ * 少量推文模板总结测试
+ */
+
+const { test } = require('node:test');
+const assert = require('node:assert');
+const { TwitterSummarizer } = require('../index');
+
+const render = tweets => TwitterSummarizer.prototype._getSparseTweetsHtml(tweets);
+
+test('链接按顺序编号', () => {
+    const html = render([
+        { id: '1', screen_name: 'alice', text: '第一条' },
+        { id: '2', screen_name: 'bob', text: '第二条' }
+    ]);
+
+    assert.deepStrictEqual(html.match(/\[\d+\]/g), ['[01]', '[02]']);
+});
+
+test('用户名、正文和链接均经过转义', () => {
+    const html = render([{ id: '1', screen_name: 'a"><b>', text: 'x < y & z' }]);
+
+    assert.ok(html.includes('x &lt; y &amp; z'));
+    assert.ok(html.includes('@a&quot;&gt;&lt;b&gt;:'));
+    assert.ok(html.includes('href="https://x.com/a%22%3E%3Cb%3E/status/1"'));
+    assert.ok(!html.includes('<b>'));
+});
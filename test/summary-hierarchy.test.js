@@ -0,0 +1,93 @@
+/**
+ * 分层总结测试：下级总结失败时上级总结应回退为读取原始推文
+ */
+
+const { test } = require('node:test');
+const assert = require('node:assert');
+const { TwitterSummarizer, TimeUtil } = require('../index');
+
+const HOUR_MS = 60 * 60 * 1000;
+
+/**
+ * 构造不连接数据库、AI 和 Telegram 的总结器实例
+ * @param {Object} db - 数据库替身
+ * @returns {TwitterSummarizer}
+ */
+function createSummarizer(db) {
+    const summarizer = Object.create(TwitterSummarizer.prototype);
+    summarizer.db = db;
+    summarizer.xaiModel = 'test-model';
+    summarizer.aiResponseCache = new Map();
+    summarizer.inFlightSummaries = new Map();
+    summarizer.throttler = { acquireRequest: async () => true, releaseRequest: () => {} };
+    summarizer.telegramToken = null;
+    summarizer.telegramChatId = null;
+    return summarizer;
+}
+
+/**
+ * 生成铺满时间范围的1小时总结记录
+ * @param {Object} timeRange - 上级时间范围
+ * @param {Function} [override] - 按序号修改单条记录
+ * @returns {Array<Object>}
+ */
+function hourlyRows(timeRange, override = () => ({})) {
+    const rows = [];
+    for (let ms = timeRange.start.getTime(), i = 0; ms < timeRange.end.getTime(); ms += HOUR_MS, i++) {
+        rows.push({
+            id: i + 1,
+            period: '1hour',
+            content: `<ol><li>第${i + 1}小时要点</li></ol>`,
+            start_time: new Date(ms).toISOString(),
+            end_time: new Date(ms + HOUR_MS).toISOString(),
+            tweet_count: 5,
+            status: 'success',
+            ...override(i)
+        });
+    }
+    return rows;
+}
+
+test('下级总结全部有效时基于下级总结生成', async () => {
+    const timeRange = TimeUtil.calculateTimeRange('12hours');
+    const rows = hourlyRows(timeRange, i => (i === 3 ? { status: 'empty', tweet_count: 0 } : {}));
+    const summarizer = createSummarizer({ getSummariesInRange: async () => rows });
+
+    const result = await summarizer._getChildSummaries('12hours', timeRange);
+
+    assert.ok(result);
+    assert.strictEqual(result.summaries.length, 11);
+    assert.strictEqual(result.tweetCount, 55);
+});
+
+test('下级总结内容为错误信息时回退为原始推文', async () => {
+    const timeRange = TimeUtil.calculateTimeRange('12hours');
+    const rows = hourlyRows(timeRange, i => (i === 5 ? {
+        content: TwitterSummarizer.prototype._getErrorHtml('AI服务不可用')
+    } : {}));
+    const summarizer = createSummarizer({ getSummariesInRange: async () => rows });
+
+    assert.strictEqual(await summarizer._getChildSummaries('12hours', timeRange), null);
+});
+
+test('AI调用失败的总结以错误状态保存', async () => {
+    const saved = [];
+    const tweets = [1, 2, 3].map(n => ({
+        id: String(n), username: 'u', screen_name: 'u', text: `推文${n}`,
+        created_at: new Date().toISOString(), created_at_ms: Date.now()
+    }));
+    const summarizer = createSummarizer({
+        getTweetsInTimeRange: async () => tweets,
+        saveSummary: async (period, content, start, end, count, status) => {
+            saved.push({ period, content, status });
+            return { id: saved.length };
+        }
+    });
+    summarizer._callAIWithRetry = async () => { throw new Error('AI服务不可用'); };
+
+    const result = await summarizer._runSummaryGeneration('1hour', { trigger: 'cron' });
+
+    assert.strictEqual(result, null);
+    assert.deepStrictEqual(saved.map(row => row.status), ['error']);
+    assert.ok(!summarizer._isUsableChildSummary(saved[0]));
+});
@@ -0,0 +1,111 @@
+/**
+ * Telegram 长消息拆分测试：每段都必须是完整的 HTML 且不超过长度上限
+ */
+
+const { test } = require('node:test');
+const assert = require('node:assert');
+const { TwitterSummarizer } = require('../index');
+
+const split = (text, limit) => TwitterSummarizer.prototype._splitTelegramMessage.call(
+    Object.create(TwitterSummarizer.prototype), text, limit);
+
+/**
+ * 检查片段中的标签成对闭合且实体未被切开
+ * @param {string} part - 消息分段
+ */
+function assertWellFormed(part) {
+    const stack = [];
+    for (const [, slash, name] of part.matchAll(/<(\/?)([a-z]+)[^>]*>/g)) {
+        if (slash) {
+            assert.strictEqual(stack.pop(), name, `标签未正确闭合: ${part}`);
+        } else {
+            stack.push(name);
+        }
+    }
+    assert.deepStrictEqual(stack, [], `存在未闭合的标签: ${part}`);
+    assert.doesNotMatch(part, /<[^>]*$|&[#\w]*$/, `分段末尾切开了标签或实体: ${part}`);
+    assert.doesNotMatch(part, /^[^<]*>|^#?\w*;/, `分段开头是被切开的标签或实体: ${part}`);
+}
+
+test('短消息原样返回', () => {
+    assert.deepStrictEqual(split('<b>标题</b>\n• 要点', 100), ['<b>标题</b>\n• 要点']);
+});
+
+test('按行切分且不超过上限', () => {
+    const lines = Array.from({ length: 10 }, (_, i) => `• 第${i}条 <a href="https://x.com/u/status/${i}">[0${i}]</a>`);
+    const parts = split(lines.join('\n'), 120);
+
+    assert.ok(parts.length > 1);
+    assert.strictEqual(parts.join('\n'), lines.join('\n'));
+    for (const part of parts) {
+        assert.ok(part.length <= 120);
+        assertWellFormed(part);
+    }
+});
+
+test('单行超长时不切开标签和实体，并在段间闭合和重新打开标签', () => {
+    const line = `• <b>重点 ${'A&amp;B 数据 '.repeat(30)}</b> <a href="https://x.com/u/status/1">[01]</a>`;
+    const parts = split(line, 80);
+
+    assert.ok(parts.length > 1);
+    for (const part of parts) {
+        assert.ok(part.length <= 80, `分段超长: ${part.length}`);
+        assertWellFormed(part);
+    }
+    assert.ok(parts[1].startsWith('<b>'));
+});
+
+test('无法安全切分时去除该行标签', () => {
+    const line = `<a href="https://x.com/${'u'.repeat(100)}">[01]</a> 说明文字`;
+    const parts = split(line, 60);
+
+    for (const part of parts) {
+        assert.ok(part.length <= 60);
+        assert.doesNotMatch(part, /</);
+    }
+    assert.strictEqual(parts.join(''), '[01] 说明文字');
+});
+
+test('去除标签后之后各行不会留下孤立的闭合标签', () => {
+    for (const text of ['<a href="u">\n\n</a>', '<a href="u">\n说明文字\n</a> 结尾', '<b>标题</b>\n<a href="u">\n\n</a>']) {
+        for (const part of split(text, 15)) {
+            assert.ok(part.length <= 15, `分段超长: ${part}`);
+            assertWellFormed(part);
+        }
+    }
+});
+
+test('随机组合的标签、实体和文字切分后每段都是完整的 HTML', () => {
+    const pieces = ['<b>', '</b>', '<i>', '</i>', '<a href="https://x.com/u/status/1">', '</a>',
+        '&amp;', '&lt;', '文字', 'text ', '\n', '\n\n', '🙂'];
+    let seed = 7;
+    const random = max => {
+        seed = (seed * 1103515245 + 12345) % 2147483648;
+        return seed % max;
+    };
+
+    for (let round = 0; round < 300; round++) {
+        // 生成标签嵌套正确的输入
+        const stack = [];
+        let text = '';
+        for (let i = 0; i < 40; i++) {
+            const piece = pieces[random(pieces.length)];
+            if (piece.startsWith('</')) {
+                if (stack.length === 0) continue;
+                text += `</${stack.pop()}>`;
+            } else if (piece.startsWith('<')) {
+                stack.push(piece.match(/^<(\w+)/)[1]);
+                text += piece;
+            } else {
+                text += piece;
+            }
+        }
+        text += stack.reverse().map(name => `</${name}>`).join('');
+
+        const limit = 10 + random(50);
+        for (const part of split(text, limit)) {
+            assert.ok(part.length <= limit, `分段超长: ${JSON.stringify(part)}`);
+            assertWellFormed(part);
+        }
+    }
+});